@@ -1,4 +1,6 @@
+from alu_gauntlet_helper.database import transaction
 from alu_gauntlet_helper.services.cars import CarsRepository, CarsService
+from alu_gauntlet_helper.services.events import DataChangeBus
 from alu_gauntlet_helper.services.maps import MapsRepository, MapsService
 from alu_gauntlet_helper.services.races import RacesService, RacesRepository
 from alu_gauntlet_helper.services.settings import SettingsService, SettingsRepository
@@ -6,6 +8,7 @@ from alu_gauntlet_helper.services.tracks import TracksRepository, TracksService
 
 
 class AppContext:
+    events: DataChangeBus
     settings: SettingsService
     maps_service: MapsService
     tracks_service: TracksService
@@ -13,10 +16,15 @@ class AppContext:
     races_service: RacesService
 
     def __init__(self):
+        self.events = DataChangeBus()
         self.settings = SettingsService(SettingsRepository())
-        self.maps_service = MapsService(MapsRepository())
-        self.tracks_service = TracksService(TracksRepository(), self.maps_service)
-        self.cars_service = CarsService(CarsRepository())
-        self.races_service = RacesService(RacesRepository(), self.tracks_service, self.cars_service)
+        self.maps_service = MapsService(MapsRepository(), self.events)
+        self.tracks_service = TracksService(TracksRepository(), self.maps_service, self.events)
+        self.cars_service = CarsService(CarsRepository(), self.events)
+        self.races_service = RacesService(RacesRepository(), self.tracks_service, self.cars_service, self.events)
+
+    @staticmethod
+    def transaction():
+        return transaction()
 
 APP_CONTEXT: AppContext = AppContext()
\ No newline at end of file
@@ -1,28 +1,200 @@
+import atexit
+import json
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 from alu_gauntlet_helper.utils.utils import get_resource_path
 
-DB_FILE = "app.db"
+DB_FILE = os.environ.get("ALU_HELPER_DB", "app.db")
 MIGRATIONS_DIR = Path(get_resource_path("migrations"))
+# migrated database with the initial catalog, built by scripts/build_seed_db.py
+SEED_DB = get_resource_path("seed.db")
+# Bump with every new migration, init_db skips the migrations directory while user_version matches it.
+# migrate() and scripts/build_seed_db.py fail when it doesn't match the latest migration.
+SCHEMA_VERSION = 7
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",   # 16 MB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456", # 256 MB
+)
+
+_local = threading.local()
+_connections: list[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
 
 def connect():
     conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def get_connection() -> sqlite3.Connection:
+    """Returns the connection bound to the current thread, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = connect()
+        _local.conn = conn
+        with _connections_lock:
+            _connections.append(conn)
+    return conn
+
+@contextmanager
+def transaction():
+    # Nested scopes join the outermost one, which commits or rolls back everything at once.
+    conn = get_connection()
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    if depth == 0:
+        _local.rollback_hooks = []
+        _local.commit_hooks = []
+    try:
+        yield conn
+        if depth == 0:
+            conn.commit()
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+            for hook in _local.rollback_hooks:
+                hook()
+        raise
+    finally:
+        _local.depth = depth
+        if depth == 0:
+            commit_hooks = _local.commit_hooks
+            _local.rollback_hooks = []
+            _local.commit_hooks = []
+
+    if depth == 0:
+        for hook in commit_hooks:
+            hook()
+
+def on_rollback(hook):
+    # Lets in-memory state written inside the current transaction be discarded if it doesn't commit.
+    if getattr(_local, "depth", 0) > 0:
+        _local.rollback_hooks.append(hook)
+
+def after_commit(hook):
+    # Defers the hook until the data written so far is visible to other connections.
+    if getattr(_local, "depth", 0) > 0:
+        _local.commit_hooks.append(hook)
+    else:
+        hook()
+
+@atexit.register
+def close_connections():
+    with _connections_lock:
+        for conn in _connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+        _connections.clear()
+    _local.__dict__.clear()
+
+def ids_sql(param: str = "ids") -> str:
+    # Ids are bound as one JSON array, so the statement text (and its cached prepared statement)
+    # is the same for any number of ids and never hits SQLite's variable limit.
+    return f"SELECT value FROM json_each(:{param})"
+
+def ids_param(ids) -> str:
+    return json.dumps([int(i) for i in ids])
+
+def migration_version(migration: Path) -> int:
+    return int(migration.name.split("__")[0])
+
+def latest_migration_version() -> int:
+    return max(migration_version(m) for m in MIGRATIONS_DIR.iterdir())
+
+def split_statements(script: str) -> list[str]:
+    # complete_statement keeps trigger bodies and quoted semicolons inside one statement
+    statements, current = [], ""
+    for part in script.split(";"):
+        current += part + ";"
+        if sqlite3.complete_statement(current):
+            statements.append(current)
+            current = ""
+    return statements
+
 def init_db():
-    with connect() as conn:
-        conn.execute("""
-                     CREATE TABLE IF NOT EXISTS migrations (
-                         id         TEXT PRIMARY KEY,
-                         applied_at datetime not null default current_timestamp
-                     )
-                     """)
-        applied = {row[0] for row in conn.execute("SELECT id FROM migrations")}
-        for migration in sorted(list(MIGRATIONS_DIR.iterdir())):
-            if migration.name not in applied:
-                with open(migration) as f:
-                    conn.executescript(f.read())
-                conn.execute("INSERT INTO migrations (id) VALUES (:migration)", {"migration": migration.name})
-                print(f"Applied migration {migration.name}")
\ No newline at end of file
+    if not os.path.exists(DB_FILE) and has_seed():
+        copy_seed()
+
+    # Fast path for every normal start: the schema is current when user_version says so.
+    conn = get_connection()
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    migrate(conn)
+
+def migrate(conn: sqlite3.Connection):
+    conn.executescript("""
+                       CREATE TABLE IF NOT EXISTS migrations (
+                           id         TEXT PRIMARY KEY,
+                           applied_at datetime not null default current_timestamp
+                       )
+                       """)
+    applied = {row[0] for row in conn.execute("SELECT id FROM migrations")}
+    migrations = sorted(MIGRATIONS_DIR.iterdir())
+    pending = [m for m in migrations if m.name not in applied]
+
+    version = latest_migration_version()
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(f"SCHEMA_VERSION is {SCHEMA_VERSION}, but the latest migration is {version}, bump it in database.py")
+
+    # executescript commits on its own, so statements run one by one to keep all pending scripts in one transaction
+    conn.execute("BEGIN")
+    try:
+        for migration in pending:
+            for statement in split_statements(migration.read_text()):
+                conn.execute(statement)
+            conn.execute("INSERT INTO migrations (id) VALUES (?)", (migration.name,))
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    for migration in pending:
+        print(f"Applied migration {migration.name}")
+
+def connect_seed() -> sqlite3.Connection:
+    return sqlite3.connect(Path(SEED_DB).absolute().as_uri() + "?mode=ro", uri=True)
+
+def copy_seed():
+    # first run: the whole seed is copied page by page instead of replaying its inserts
+    seed = connect_seed()
+    target = sqlite3.connect(DB_FILE)
+    try:
+        seed.backup(target)
+    finally:
+        target.close()
+        seed.close()
+    print("Created database from seed")
+
+def has_seed() -> bool:
+    return os.path.exists(SEED_DB)
+
+def merge_seed():
+    # adds catalog entries of a newer seed to an existing database, user edits win on conflicts
+    conn = get_connection()
+    conn.execute("ATTACH DATABASE :seed AS seed", {"seed": SEED_DB})
+    try:
+        with transaction():
+            conn.execute("INSERT INTO maps (name) SELECT name FROM seed.maps WHERE true"
+                         " ON CONFLICT DO NOTHING")
+            conn.execute("INSERT INTO tracks (map_id, name)"
+                         " SELECT m.id, t.name FROM seed.tracks t"
+                         " JOIN seed.maps sm ON sm.id = t.map_id"
+                         " JOIN main.maps m ON m.name = sm.name COLLATE NOCASE"
+                         " WHERE true ON CONFLICT DO NOTHING")
+            conn.execute("INSERT INTO cars (name, `rank`) SELECT name, `rank` FROM seed.cars WHERE true"
+                         " ON CONFLICT DO NOTHING")
+    finally:
+        conn.execute("DETACH DATABASE seed")
@@ -1,13 +1,20 @@
 from typing import Generic, TypeVar
 from pydantic import BaseModel
-from pydantic.generics import GenericModel
 
 T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
 
 
-class PageResult(GenericModel, Generic[T]):
+def from_row(model: type[M], row, **values) -> M | None:
+    # rows come from our own schema, so validation is skipped on the read path
+    if not row:
+        return None
+    return model.model_construct(**{**dict(row), **values})
+
+
+class PageResult(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    total: int | None = None # only counted for the first page
 
 class RaceAddModel(BaseModel):
     track_id: int
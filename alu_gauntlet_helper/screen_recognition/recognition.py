@@ -1,14 +1,47 @@
 import re
+import threading
 
-import cv2
-import numpy as np
-import pytesseract
-from PIL import Image
 from pydantic import BaseModel
 
-from alu_gauntlet_helper.app_context import APP_CONTEXT
+from alu_gauntlet_helper.services.cars import CarsService
+from alu_gauntlet_helper.services.search_index import SearchMatch
 from alu_gauntlet_helper.utils.utils import parse_time
 
+# OpenCV, NumPy, pytesseract and PIL are the heaviest imports of the app,
+# they are loaded on first use (or by warm_up) instead of at startup.
+HEAVY_MODULES = ("cv2", "numpy", "pytesseract", "PIL")
+
+# Укажите путь к исполняемому файлу tesseract.exe,
+# если он не находится в PATH вашей системы.
+# ЗАМЕНИТЕ ЭТОТ ПУТЬ В СООТВЕТСТВИИ С ВАШЕЙ УСТАНОВКОЙ:
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+
+def load_imaging():
+    import cv2
+    import numpy
+    import pytesseract
+    from PIL import Image
+
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return cv2, numpy, pytesseract, Image
+
+_warm_up_started = False
+
+def warm_up():
+    global _warm_up_started
+    if _warm_up_started:
+        return
+    _warm_up_started = True
+
+    def run():
+        try:
+            load_imaging()
+        except ImportError as e:
+            print(f"Failed to load recognition modules: {e}")
+
+    threading.Thread(target=run, name="recognition-warm-up", daemon=True).start()
+
 
 class RaceInfo(BaseModel):
     track: str | None = None
@@ -45,7 +78,8 @@ race_box_attrs = RectAttrs(
 )
 
 
-def find_race_boxes(image_bytes):
+def find_race_boxes(image_bytes, cars_service: CarsService):
+    cv2, np, _, _ = load_imaging()
     nparr = np.frombuffer(image_bytes, np.uint8)
     image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
@@ -56,7 +90,7 @@ def find_race_boxes(image_bytes):
     for race_box in race_boxes:
         cropped = crop(image, race_box['x'], race_box['y'], race_box['w'], race_box['h'])
         res = recognize_text_in_rectangle(cropped)
-        result.append(parse_race(res))
+        result.append(parse_race(res, cars_service))
 
     return result
 
@@ -64,7 +98,17 @@ car_regex = re.compile(r'[A-Z0-9 -+]{2,}')
 rank_regex = re.compile(r'([0-9],)?[0-9]{3}')
 time_regex = re.compile(r'[0-9]{2}:[0-9]{2}\.[0-9]{3}')
 
-def parse_race(text: str) -> RaceInfo:
+CAR_MIN_SCORE = 0.75
+
+def match_name(matches: list[SearchMatch]):
+    # accept only a confident match that is clearly ahead of the next one
+    if not matches or matches[0].score < CAR_MIN_SCORE:
+        return None
+    if len(matches) > 1 and matches[1].score >= matches[0].score:
+        return None
+    return matches[0].item
+
+def parse_race(text: str, cars_service: CarsService) -> RaceInfo:
     info = RaceInfo()
 
     lines = [l for l in text.splitlines() if l and "RACE" not in l]
@@ -87,16 +131,17 @@ def parse_race(text: str) -> RaceInfo:
             break
 
     while index >= 0:
-        cars_autocomplete = APP_CONTEXT.cars_service.autocomplete(lines[index])
+        car = match_name(cars_service.match(lines[index], limit=2))
         index -= 1
-        if cars_autocomplete and len(cars_autocomplete) == 1:
-            info.car = cars_autocomplete[0].name
+        if car:
+            info.car = car.name
             break
 
     return info
 
 
 def find_rectangles(image, attrs: RectAttrs):
+    cv2, np, _, _ = load_imaging()
     output_image = image.copy()
 
     # 2. Преобразование в оттенки серого
@@ -157,12 +202,8 @@ def find_rectangles(image, attrs: RectAttrs):
 def crop(image, x: int, y: int, w: int, h: int):
     return image[y:y + h, x:x + w]
 
-# Укажите путь к исполняемому файлу tesseract.exe,
-# если он не находится в PATH вашей системы.
-# ЗАМЕНИТЕ ЭТОТ ПУТЬ В СООТВЕТСТВИИ С ВАШЕЙ УСТАНОВКОЙ:
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
 def recognize_text_in_rectangle(image) -> str:
+    cv2, _, pytesseract, Image = load_imaging()
     # 3. Преобразование из BGR (OpenCV) в RGB (требуется для PIL/Tesseract)
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
@@ -1,6 +1,11 @@
-from alu_gauntlet_helper.database import connect
+from alu_gauntlet_helper.database import transaction, ids_sql, ids_param, on_rollback
 from pydantic import BaseModel
 
+from alu_gauntlet_helper.models import from_row
+from alu_gauntlet_helper.services.catalog_cache import CatalogCache
+from alu_gauntlet_helper.services.events import DataChangeBus, ENTITY_CARS
+from alu_gauntlet_helper.services.search_index import SearchMatch
+
 
 class Car(BaseModel):
     id: int = 0
@@ -10,62 +15,79 @@ class Car(BaseModel):
 class CarsRepository:
     @staticmethod
     def parse(row):
-        return Car(**row) if row else None
-
-    def add(self, item: Car) -> int:
-        with connect() as conn:
-            return conn.execute("INSERT INTO cars(name, `rank`) VALUES (:name, :rank)", item.model_dump()).lastrowid
-
+        return from_row(Car, row)
+
+    def upsert(self, item: Car, update_empty_rank) -> int:
+        with transaction() as conn:
+            return conn.execute("INSERT INTO cars(name, `rank`) VALUES (:name, :rank)"
+                                " ON CONFLICT(name COLLATE NOCASE) DO UPDATE SET name = excluded.name,"
+                                " `rank` = CASE WHEN :update_empty_rank OR excluded.`rank` > 0"
+                                " THEN excluded.`rank` ELSE cars.`rank` END"
+                                " RETURNING id", {**item.model_dump(), "update_empty_rank": update_empty_rank}).fetchone()[0]
+
+    def upsert_all(self, items: list[Car]):
+        with transaction() as conn:
+            conn.executemany("INSERT INTO cars(name, `rank`) VALUES (:name, :rank)"
+                             " ON CONFLICT(name COLLATE NOCASE) DO UPDATE SET `rank` = excluded.`rank` WHERE excluded.`rank` > 0",
+                             [i.model_dump() for i in items])
 
     def get_by_name(self, name: str):
-        with connect() as conn:
+        with transaction() as conn:
             row = conn.execute("SELECT * FROM cars WHERE name = :name COLLATE NOCASE LIMIT 1", {"name": name}).fetchone()
             return self.parse(row)
 
-    def autocomplete(self, query: str):
-        with connect() as conn:
-            sql = "SELECT * FROM cars"
-            params = {}
-
-            if query:
-                sql += " WHERE name LIKE :query"
-                params = {"query": f"%{query}%"}
-
-            rows = conn.execute(sql + " ORDER BY `rank` DESC, name LIMIT 100", params).fetchall()
-            return [self.parse(row) for row in rows]
+    def get_catalog(self):
+        with transaction() as conn:
+            return [self.parse(row) for row in conn.execute("SELECT * FROM cars").fetchall()]
 
     def update(self, item: Car, update_empty_rank):
-        with connect() as conn:
+        with transaction() as conn:
             rank_update = ", `rank` = :rank" if update_empty_rank or item.rank > 0 else ""
             conn.execute(f"UPDATE cars SET name = :name {rank_update} WHERE id = :id", item.model_dump())
 
     def get_by_ids(self, ids):
-        ids_str = ", ".join(str(id) for id in ids)
-
-        with connect() as conn:
-            rows = conn.execute(f"SELECT * FROM cars WHERE id in ({ids_str})").fetchall()
+        with transaction() as conn:
+            rows = conn.execute(f"SELECT * FROM cars WHERE id IN ({ids_sql()})", {"ids": ids_param(ids)}).fetchall()
             return [self.parse(row) for row in rows]
 
 
 class CarsService:
-    def __init__(self, repo: CarsRepository):
+    def __init__(self, repo: CarsRepository, events: DataChangeBus):
         self.repo = repo
+        self.events = events
+        self.cache = CatalogCache(repo.get_catalog, name_key=lambda c: c.name.lower(),
+                                  order=lambda c: (-c.rank, c.name))
+
+    def search(self, query: str) -> list[Car]:
+        return self.cache.search(query)
 
-    def autocomplete(self, query: str = ""):
-        return self.repo.autocomplete(query.strip())
+    def match(self, query: str, limit: int | None = None) -> list[SearchMatch[Car]]:
+        return self.cache.match(query, limit)
 
     def get_by_ids(self, ids: set[int]) -> dict[int, Car]:
         if not ids:
             return dict()
-        items = self.repo.get_by_ids(ids)
-        return {i.id: i for i in items}
+        return self.cache.get_by_ids(ids)
+
+    def get_by_name(self, name: str) -> Car | None:
+        return self.cache.get_by_name(name.lower())
+
+    def save_all(self, items: list[Car]):
+        if items:
+            self.repo.upsert_all(items)
+            self.cache.invalidate()
+            self.events.emit(ENTITY_CARS)
 
     def save(self, item: Car, update_empty_rank = True) -> int:
-        if item.id <= 0:
-            existing = self.repo.get_by_name(item.name)
-            if not existing:
-                return self.repo.add(item)
-            item.id = existing.id
-
-        self.repo.update(item, update_empty_rank)
-        return item.id
\ No newline at end of file
+        with transaction():
+            if item.id <= 0:
+                id_ = self.repo.upsert(item, update_empty_rank)
+            else:
+                self.repo.update(item, update_empty_rank)
+                id_ = item.id
+
+            on_rollback(self.cache.invalidate)
+            for car in self.repo.get_by_ids({id_}):
+                self.cache.put(car)
+            self.events.emit(ENTITY_CARS, {id_})
+        return id_
\ No newline at end of file
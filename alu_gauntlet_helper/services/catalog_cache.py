@@ -0,0 +1,69 @@
+from typing import Any, Callable, Generic, Hashable, Iterable, TypeVar
+
+from alu_gauntlet_helper.services.search_index import SearchIndex, SearchMatch
+
+T = TypeVar("T")
+
+
+# Not locked: the cache and its search index are only used from the GUI thread,
+# the query worker runs plain SQL.
+class CatalogCache(Generic[T]):
+    def __init__(self, load: Callable[[], list[T]], name_key: Callable[[T], Hashable],
+                 search_keys: Callable[[T], Iterable[str]] | None = None, order: Callable[[T], Any] | None = None):
+        self.load = load
+        self.name_key = name_key
+        self.search_keys = search_keys or (lambda i: [i.name])
+        self.order = order or (lambda i: i.name.lower())
+        self._by_id: dict[int, T] | None = None
+        self._by_name: dict[Hashable, T] | None = None
+        self._index: SearchIndex[T] | None = None
+
+    def _ensure_loaded(self):
+        if self._by_id is None:
+            items = self.load()
+            self._by_name = {self.name_key(i): i for i in items}
+            self._by_id = {i.id: i for i in items}
+
+    def all(self) -> list[T]:
+        self._ensure_loaded()
+        return list(self._by_id.values())
+
+    def get(self, id_: int) -> T | None:
+        self._ensure_loaded()
+        return self._by_id.get(id_)
+
+    def get_by_ids(self, ids: Iterable[int]) -> dict[int, T]:
+        self._ensure_loaded()
+        return {i: self._by_id[i] for i in ids if i in self._by_id}
+
+    def get_by_name(self, key: Hashable) -> T | None:
+        self._ensure_loaded()
+        return self._by_name.get(key)
+
+    def _ensure_indexed(self) -> SearchIndex[T]:
+        index = self._index
+        if index is None:
+            index = SearchIndex(sorted(self.all(), key=self.order), self.search_keys)
+            self._index = index
+        return index
+
+    def search(self, query: str) -> list[T]:
+        return self._ensure_indexed().search(query)
+
+    def match(self, query: str, limit: int | None = None) -> list[SearchMatch[T]]:
+        return self._ensure_indexed().match(query, limit)
+
+    def put(self, item: T):
+        self._index = None
+        if self._by_id is None:
+            return
+        old = self._by_id.get(item.id)
+        if old is not None:
+            self._by_name.pop(self.name_key(old), None)
+        self._by_id[item.id] = item
+        self._by_name[self.name_key(item)] = item
+
+    def invalidate(self):
+        self._index = None
+        self._by_id = None
+        self._by_name = None
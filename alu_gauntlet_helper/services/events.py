@@ -0,0 +1,29 @@
+from typing import Callable, Iterable, NamedTuple
+
+from alu_gauntlet_helper.database import after_commit
+
+ENTITY_MAPS = "maps"
+ENTITY_TRACKS = "tracks"
+ENTITY_CARS = "cars"
+ENTITY_RACES = "races"
+
+
+class DataChange(NamedTuple):
+    entity: str
+    ids: frozenset[int] # empty when any row may have changed
+
+
+class DataChangeBus:
+    def __init__(self):
+        self.listeners: list[Callable[[DataChange], None]] = []
+
+    def subscribe(self, listener: Callable[[DataChange], None]):
+        self.listeners.append(listener)
+
+    def emit(self, entity: str, ids: Iterable[int] = ()):
+        change = DataChange(entity, frozenset(ids))
+        after_commit(lambda: self.notify(change))
+
+    def notify(self, change: DataChange):
+        for listener in self.listeners:
+            listener(change)
@@ -1,13 +1,24 @@
+import hashlib
+
 from alu_gauntlet_helper.app_context import APP_CONTEXT
 from alu_gauntlet_helper.services.cars import Car
 from alu_gauntlet_helper.services.tracks import TrackView
 
 
 def init_data():
+    with APP_CONTEXT.transaction():
+        APP_CONTEXT.cars_service.save_all(cars)
+        APP_CONTEXT.tracks_service.save_all(tracks)
+
+def catalog_version() -> str:
+    # scripts/build_seed_db.py stores this version in the seed, so startup can tell
+    # whether the bundled seed has a newer catalog without opening it
+    digest = hashlib.sha1()
     for car in cars:
-        APP_CONTEXT.cars_service.save(car)
+        digest.update(f"car|{car.name}|{car.rank}\n".encode())
     for track in tracks:
-        APP_CONTEXT.tracks_service.save(track)
+        digest.update(f"track|{track.map_name}|{track.name}\n".encode())
+    return digest.hexdigest()
 
 
 # https://asphalt9.info/asphalt9/tuning/asphalt-9-car-list/
@@ -1,6 +1,11 @@
-from alu_gauntlet_helper.database import connect
+from alu_gauntlet_helper.database import transaction, ids_sql, ids_param, on_rollback
 from pydantic import BaseModel
 
+from alu_gauntlet_helper.models import from_row
+from alu_gauntlet_helper.services.catalog_cache import CatalogCache
+from alu_gauntlet_helper.services.events import DataChangeBus, ENTITY_MAPS
+from alu_gauntlet_helper.services.search_index import SearchMatch
+
 
 class Map(BaseModel):
     id: int = 0
@@ -10,63 +15,85 @@ class Map(BaseModel):
 class MapsRepository:
     @staticmethod
     def parse(row):
-        return Map(**row) if row else None
+        return from_row(Map, row)
+
+    def upsert(self, item: Map) -> int:
+        with transaction() as conn:
+            return conn.execute("INSERT INTO maps (name, icon) VALUES (:name, :icon)"
+                                " ON CONFLICT(name COLLATE NOCASE) DO UPDATE SET name = excluded.name, icon = excluded.icon"
+                                " RETURNING id", item.model_dump()).fetchone()[0]
 
-    def add(self, item: Map) -> int:
-        with connect() as conn:
-            return conn.execute("INSERT INTO maps (name, icon) VALUES (:name, :icon)", item.model_dump()).lastrowid
+    def get_or_add(self, name: str) -> int:
+        with transaction() as conn:
+            # no-op update, so that RETURNING yields the id of an existing map without touching it
+            return conn.execute("INSERT INTO maps (name) VALUES (:name)"
+                                " ON CONFLICT(name COLLATE NOCASE) DO UPDATE SET icon = icon"
+                                " RETURNING id", {"name": name}).fetchone()[0]
 
     def update(self, item: Map):
-        with connect() as conn:
+        with transaction() as conn:
             conn.execute("UPDATE maps SET name = :name, icon = :icon WHERE id = :id", item.model_dump())
 
     def get_by_name(self, name: str):
-        with connect() as conn:
+        with transaction() as conn:
             row = conn.execute("SELECT * FROM maps WHERE name = :name COLLATE NOCASE LIMIT 1", {"name": name}).fetchone()
             return self.parse(row)
 
-    def get_all(self, query: str):
-        with connect() as conn:
-            sql = "SELECT * FROM maps"
-            params = {}
-
-            if query:
-                sql += " WHERE name LIKE :query"
-                params = {"query": f"%{query}%"}
-
-            rows = conn.execute(sql + " ORDER BY name LIMIT 100", params).fetchall()
-            return [self.parse(row) for row in rows]
+    def get_catalog(self):
+        with transaction() as conn:
+            return [self.parse(row) for row in conn.execute("SELECT * FROM maps").fetchall()]
 
     def get_by_ids(self, ids):
-        ids_str = ", ".join(str(id) for id in ids)
-
-        with connect() as conn:
-            rows = conn.execute(f"SELECT * FROM maps WHERE id in ({ids_str})").fetchall()
+        with transaction() as conn:
+            rows = conn.execute(f"SELECT * FROM maps WHERE id IN ({ids_sql()})", {"ids": ids_param(ids)}).fetchall()
             return [self.parse(row) for row in rows]
 
 
 class MapsService:
-    def __init__(self, repo: MapsRepository):
+    def __init__(self, repo: MapsRepository, events: DataChangeBus):
         self.repo = repo
+        self.events = events
+        self.cache = CatalogCache(repo.get_catalog, name_key=lambda m: m.name.lower())
+
+    def get_by_name(self, name: str) -> Map | None:
+        return self.cache.get_by_name(name.lower())
 
-    def get_by_name(self, name: str) -> Map:
-        return self.repo.get_by_name(name)
+    def search(self, query: str) -> list[Map]:
+        return self.cache.search(query)
 
-    def autocomplete(self, query: str):
-        return self.repo.get_all(query.strip())
+    def match(self, query: str, limit: int | None = None) -> list[SearchMatch[Map]]:
+        return self.cache.match(query, limit)
 
     def get_by_ids(self, ids: set[int]) -> dict[int, Map]:
         if not ids:
             return dict()
-        items = self.repo.get_by_ids(ids)
-        return {m.id: m for m in items}
+        return self.cache.get_by_ids(ids)
+
+    def get_icons(self) -> set[str]:
+        return {m.icon for m in self.cache.all() if m.icon}
+
+    def get_or_add(self, name: str) -> int:
+        existing = self.get_by_name(name)
+        if existing:
+            return existing.id
+
+        with transaction():
+            id_ = self.repo.get_or_add(name)
+            self.refresh_cached(id_)
+        return id_
 
     def save(self, item: Map) -> int:
-        if item.id <= 0:
-            existing = self.repo.get_by_name(item.name)
-            if not existing:
-                return self.repo.add(item)
-            item.id = existing.id
-
-        self.repo.update(item)
-        return item.id
+        with transaction():
+            if item.id <= 0:
+                id_ = self.repo.upsert(item)
+            else:
+                self.repo.update(item)
+                id_ = item.id
+            self.refresh_cached(id_)
+        return id_
+
+    def refresh_cached(self, id_: int):
+        on_rollback(self.cache.invalidate)
+        for item in self.repo.get_by_ids({id_}):
+            self.cache.put(item)
+        self.events.emit(ENTITY_MAPS, {id_})
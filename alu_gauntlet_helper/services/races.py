@@ -1,12 +1,17 @@
 from datetime import datetime
+from typing import NamedTuple
 
 from pydantic import BaseModel, field_validator
 
-from alu_gauntlet_helper.database import connect
+from alu_gauntlet_helper.database import transaction, ids_sql, ids_param
+from alu_gauntlet_helper.models import PageResult, from_row
 from alu_gauntlet_helper.services.cars import CarsService, Car
+from alu_gauntlet_helper.services.events import DataChangeBus, ENTITY_RACES
 from alu_gauntlet_helper.services.tracks import TracksService, TrackView
 from alu_gauntlet_helper.utils.utils import parse_utc_datetime
 
+PAGE_SIZE = 100
+
 
 class Race(BaseModel):
     id: int = 0
@@ -29,76 +34,119 @@ class RaceView(Race):
     car_name: str = ""
 
 
+class RaceFilter(NamedTuple):
+    # None when the list is not filtered by tracks or cars
+    track_ids: frozenset[int] | None = None
+    car_ids: frozenset[int] | None = None
+
+
 class RacesRepository:
     @staticmethod
     def parse(row):
-        return Race(**row) if row else None
-
-    def add(self, item: Race):
-        with connect() as conn:
-            conn.execute("INSERT INTO races"
-                         " (track_id, car_id, `rank`, time, bad_timing, note) VALUES"
-                         " (:track_id, :car_id, :rank, :time, :bad_timing, :note)",
-                         item.model_dump())
-
-    def get_all(self, track_query: str, car_query: str):
-        with (connect() as conn):
-            sql = ("SELECT r.* FROM races r"
-                   " LEFT JOIN tracks t ON r.track_id = t.id"
-                   " LEFT JOIN maps m ON t.map_id = m.id"
-                   " LEFT JOIN cars c ON r.car_id = c.id")
-            params = {}
-
-            sql += " WHERE 1 = 1"
-            if track_query:
-                sql += " AND (t.name LIKE :track_query OR m.name LIKE :track_query)"
-                params['track_query'] = f"%{track_query}%"
-
-            if car_query:
-                sql += " AND c.name LIKE :car_query"
-                params['car_query'] = f"%{car_query}%"
-
-            rows = conn.execute(sql + " ORDER BY r.created_at DESC LIMIT 100", params).fetchall()
+        if not row:
+            return None
+        return from_row(RaceView, row, bad_timing=bool(row["bad_timing"]), created_at=parse_utc_datetime(row["created_at"]))
+
+    def add(self, item: Race) -> int:
+        with transaction() as conn:
+            return conn.execute("INSERT INTO races"
+                         " (track_id, car_id, `rank`, time, bad_timing, note, created_ts) VALUES"
+                         " (:track_id, :car_id, :rank, :time, :bad_timing, :note, CAST(strftime('%s', 'now') AS INTEGER))",
+                         item.model_dump()).lastrowid
+
+    @staticmethod
+    def filters(race_filter: RaceFilter):
+        sql = " WHERE 1 = 1"
+        params = {}
+
+        if race_filter.track_ids is not None:
+            sql += f" AND r.track_id IN ({ids_sql('track_ids')})"
+            params['track_ids'] = ids_param(race_filter.track_ids)
+
+        if race_filter.car_ids is not None:
+            sql += f" AND r.car_id IN ({ids_sql('car_ids')})"
+            params['car_ids'] = ids_param(race_filter.car_ids)
+
+        return sql, params
+
+    def get_page(self, race_filter: RaceFilter, after: Race | None, limit: int):
+        where, params = self.filters(race_filter)
+        if after:
+            where += " AND (r.created_ts, r.id) < (:after_ts, :after_id)"
+            params['after_ts'] = int(after.created_at.timestamp())
+            params['after_id'] = after.id
+        params['limit'] = limit
+
+        return self.select(where + " ORDER BY r.created_ts DESC, r.id DESC LIMIT :limit", params)
+
+    def get_by_ids(self, ids, race_filter: RaceFilter):
+        where, params = self.filters(race_filter)
+        params['ids'] = ids_param(ids)
+        return self.select(where + f" AND r.id IN ({ids_sql()})", params)
+
+    def select(self, where: str, params: dict):
+        with transaction() as conn:
+            rows = conn.execute("SELECT r.id, r.track_id, r.car_id, r.`rank`, r.time, r.bad_timing, r.note,"
+                                " r.created_ts AS created_at,"
+                                " COALESCE(m.name, 'Unknown Map') AS map_name,"
+                                " COALESCE(t.name, 'Unknown Track') AS track_name,"
+                                " COALESCE(c.name, 'Unknown Car') AS car_name"
+                                " FROM races r"
+                                " LEFT JOIN tracks t ON r.track_id = t.id"
+                                " LEFT JOIN maps m ON t.map_id = m.id"
+                                " LEFT JOIN cars c ON r.car_id = c.id"
+                                + where, params).fetchall()
             return [self.parse(row) for row in rows]
 
+    def count(self, race_filter: RaceFilter) -> int:
+        where, params = self.filters(race_filter)
+        with transaction() as conn:
+            return conn.execute("SELECT count(*) FROM races r" + where, params).fetchone()[0]
+
     def update(self, item: Race):
-        with connect() as conn:
+        with transaction() as conn:
             conn.execute("UPDATE races SET"
                          " track_id = :track_id, car_id = :car_id, `rank` = :rank, time = :time,"
                          " bad_timing = :bad_timing, note = :note"
                          " WHERE id = :id", item.model_dump())
 
 class RacesService:
-    def __init__(self, repo: RacesRepository, tracks: TracksService, cars: CarsService):
+    def __init__(self, repo: RacesRepository, tracks: TracksService, cars: CarsService, events: DataChangeBus):
         self.repo = repo
         self.tracks = tracks
         self.cars = cars
-
-    def to_views(self, items: list[Race]):
-        tracks = self.tracks.get_by_ids({i.track_id for i in items})
-        cars = self.cars.get_by_ids({i.car_id for i in items})
-        result = []
-        for i in items:
-            track = tracks.get(i.track_id)
-            car = cars.get(i.car_id)
-            result.append(RaceView(
-                **i.model_dump(),
-                map_name=track.map_name if track else "Unknown Map",
-                track_name=track.name if track else "Unknown Track",
-                car_name=car.name if car else "Unknown Car"
-            ))
-        return result
-
-    def get_all(self, track_query: str, car_query: str) -> list[RaceView]:
-        return self.to_views(self.repo.get_all(track_query, car_query))
-
-    def save(self, item: RaceView):
-        if item.track_id <= 0:
-            item.track_id = self.tracks.save(TrackView(name=item.track_name, map_name=item.map_name))
-        if item.car_id <= 0 or item.rank > 0:
-            item.car_id = self.cars.save(Car(name=item.car_name, rank=item.rank), False)
-
-        if item.id <= 0:
-            self.repo.add(item)
-        else:
-            self.repo.update(item)
\ No newline at end of file
+        self.events = events
+
+    def filter(self, track_query: str, car_query: str) -> RaceFilter:
+        # names are matched like in the other tabs, the race queries then only bind ids;
+        # track views carry the map name, so a map name finds all of its tracks
+        return RaceFilter(
+            track_ids=frozenset(m.item.id for m in self.tracks.match(track_query)) if track_query else None,
+            car_ids=frozenset(m.item.id for m in self.cars.match(car_query)) if car_query else None)
+
+    def get_page(self, race_filter: RaceFilter, after: Race | None = None,
+                 limit: int = PAGE_SIZE) -> PageResult[RaceView]:
+        items = self.repo.get_page(race_filter, after, limit)
+        # the count scans every filtered race, the following pages keep the first page's total
+        total = self.repo.count(race_filter) if after is None else None
+        return PageResult[RaceView](items=items, total=total)
+
+    def get_views(self, ids: set[int], race_filter: RaceFilter = RaceFilter()) -> list[RaceView]:
+        if not ids:
+            return []
+        return self.repo.get_by_ids(ids, race_filter)
+
+    def save(self, item: RaceView) -> int:
+        with transaction():
+            if item.track_id <= 0:
+                item.track_id = self.tracks.save(TrackView(name=item.track_name, map_name=item.map_name))
+            if item.car_id <= 0 or item.rank > 0:
+                item.car_id = self.cars.save(Car(name=item.car_name, rank=item.rank), False)
+
+            if item.id <= 0:
+                id_ = self.repo.add(item)
+            else:
+                self.repo.update(item)
+                id_ = item.id
+            self.events.emit(ENTITY_RACES, {id_})
+            return id_
\ No newline at end of file
@@ -0,0 +1,178 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Callable, Generic, Iterable, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+SEARCH_LIMIT = 100
+MIN_SCORE = 0.5
+
+WORD_SPLIT = re.compile(r"[\W_]+")
+
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.9
+SCORE_INITIALS = 0.8
+SCORE_CONTAINS = 0.7
+SCORE_TYPO = 0.8
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in WORD_SPLIT.split(normalize(text)) if t]
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def max_typos(token: str) -> int:
+    if len(token) < 3:
+        return 0
+    return 1 if len(token) < 6 else 2
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    # Levenshtein distance counting a swap of adjacent letters as one edit,
+    # gives up with limit + 1 once every path exceeds the limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class SearchMatch(NamedTuple, Generic[T]):
+    item: T
+    score: float
+
+
+class SearchIndex(Generic[T]):
+    def __init__(self, items: list[T], keys: Callable[[T], Iterable[str]]):
+        self.items = items
+        self.tokens = [[t for key in keys(item) if key for t in tokenize(key)] for item in items]
+        # initials of every key, "Chiron Super Sport" -> "css", so abbreviations match
+        self.initials = [" ".join("".join(t[0] for t in tokenize(key)) for key in keys(item) if key) for item in items]
+
+        self.positions: dict[str, set[int]] = {}
+        for pos, item_tokens in enumerate(self.tokens):
+            for token in item_tokens:
+                self.positions.setdefault(token, set()).add(pos)
+
+        # sorted vocabulary acts as a flattened prefix trie: all tokens starting
+        # with a prefix form one contiguous range
+        self.vocabulary = sorted(self.positions)
+        # bit per (character, occurrence), so that the characters of a query missing
+        # from a token, repeated ones included, are counted with one bit_count
+        self.char_bits: dict[tuple[str, int], int] = {}
+        self.vocabulary_chars = [(token, self.char_mask(token)) for token in self.vocabulary]
+        self.postings: dict[str, set[str]] = {}
+        for token in self.vocabulary:
+            for trigram in trigrams(token):
+                self.postings.setdefault(trigram, set()).add(token)
+        # typing re-scores the same leading tokens on every keystroke
+        self.scores_cache: dict[str, dict[int, float]] = {}
+
+    def char_mask(self, text: str) -> int:
+        mask, seen = 0, {}
+        for c in text:
+            seen[c] = seen.get(c, 0) + 1
+            mask |= 1 << self.char_bits.setdefault((c, seen[c]), len(self.char_bits))
+        return mask
+
+    def starting_with(self, prefix: str) -> Iterable[str]:
+        for i in range(bisect_left(self.vocabulary, prefix), len(self.vocabulary)):
+            token = self.vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def containing(self, part: str) -> Iterable[str]:
+        if len(part) < 3:
+            return (t for t in self.vocabulary if part in t)
+        postings = sorted((self.postings.get(t, set()) for t in trigrams(part)), key=len)
+        return (t for t in set.intersection(*postings) if part in t)
+
+    def token_scores(self, query_token: str) -> dict[int, float]:
+        scores = self.scores_cache.get(query_token)
+        if scores is None:
+            scores = self.scores_cache[query_token] = self.compute_token_scores(query_token)
+        return scores
+
+    def compute_token_scores(self, query_token: str) -> dict[int, float]:
+        token_scores = {}
+
+        def add(token: str, score: float):
+            if token_scores.get(token, 0) < score:
+                token_scores[token] = score
+
+        for token in self.containing(query_token):
+            add(token, SCORE_CONTAINS)
+        for token in self.starting_with(query_token):
+            add(token, SCORE_EXACT if token == query_token else SCORE_PREFIX)
+
+        # typos are looked for only when the token matches nothing as typed
+        limit = max_typos(query_token) if not token_scores else 0
+        if limit:
+            chars = self.char_mask(query_token)
+            for token, token_chars in self.vocabulary_chars:
+                # every typo accounts for at most one query character missing from the token
+                if (chars & ~token_chars).bit_count() > limit:
+                    continue
+                distance = edit_distance(query_token, token, limit)
+                if distance and len(token) > len(query_token):
+                    # compare with the token's prefix too, the last word may still be typed
+                    distance = min(distance, edit_distance(query_token, token[:len(query_token)], distance - 1))
+                if distance <= limit:
+                    add(token, SCORE_TYPO * (1 - distance / len(query_token)))
+
+        scores = {}
+        for token, score in token_scores.items():
+            for pos in self.positions[token]:
+                if scores.get(pos, 0) < score:
+                    scores[pos] = score
+
+        if len(query_token) >= 2:
+            for pos, initials in enumerate(self.initials):
+                if query_token in initials and scores.get(pos, 0) < SCORE_INITIALS:
+                    scores[pos] = SCORE_INITIALS
+        return scores
+
+    def match(self, query: str, limit: int | None = SEARCH_LIMIT, min_score: float = MIN_SCORE) -> list[SearchMatch[T]]:
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return [SearchMatch(item, 1.0) for item in self.items[:limit]]
+
+        # every query token has to match some token of the item
+        totals = None
+        for query_token in query_tokens:
+            scores = self.token_scores(query_token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {pos: total + scores[pos] for pos, total in totals.items() if pos in scores}
+            if not totals:
+                return []
+
+        result = []
+        for pos, total in totals.items():
+            # a small bonus for covering more of the name, so the shortest full match wins
+            coverage = len(query_tokens) / max(len(query_tokens), len(self.tokens[pos]))
+            score = 0.9 * total / len(query_tokens) + 0.1 * coverage
+            if score >= min_score:
+                result.append((-score, pos))
+        result.sort()
+        return [SearchMatch(self.items[pos], -score) for score, pos in result[:limit]]
+
+    def search(self, query: str, limit: int | None = SEARCH_LIMIT) -> list[T]:
+        return [m.item for m in self.match(query, limit)]
@@ -1,9 +1,13 @@
-from alu_gauntlet_helper.database import connect
-from pydantic import BaseModel
+from alu_gauntlet_helper.database import transaction
+from pydantic import BaseModel, ConfigDict
 
 
 class Settings(BaseModel):
+    # snapshots are shared as is, changes go through model_copy(update=...)
+    model_config = ConfigDict(frozen=True)
+
     initial_data_loaded: bool = False
+    seed_version: str = ""
     window_geometry: str = ""
     window_state: str = ""
 
@@ -13,31 +17,35 @@ class Settings(BaseModel):
 
 class SettingsRepository:
 
-    def save(self, key: str, value: str):
-        with connect() as conn:
-            conn.execute("INSERT OR REPLACE INTO settings(`key`, value) VALUES (:key, :value)", {"key": key, "value": value})
+    def save_all(self, values: dict[str, str]):
+        with transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO settings(`key`, value) VALUES (?, ?)", values.items())
 
     def get_all(self):
-        with connect() as conn:
+        with transaction() as conn:
             rows = conn.execute("SELECT * FROM settings").fetchall()
             data = {row["key"]: row["value"] for row in rows}
             return Settings(**data)
 
 
 class SettingsService:
-    cache = None
-
     def __init__(self, repo: SettingsRepository):
         self.repo = repo
-
-    def save(self, settings: Settings):
-        for key, value1 in self.get().model_dump().items():
-            value2 = getattr(settings, key)
-            if value1 != value2:
-                self.repo.save(key, str(value2))
-        self.cache = None
+        self.cache: Settings | None = None
 
     def get(self) -> Settings:
-        if not self.cache:
+        if self.cache is None:
             self.cache = self.repo.get_all()
-        return Settings(**self.cache.model_dump())
\ No newline at end of file
+        return self.cache
+
+    def save(self, settings: Settings):
+        current = self.get()
+        changed = {key: str(value) for key, value in settings.model_dump().items() if value != getattr(current, key)}
+        if changed:
+            self.repo.save_all(changed)
+        self.cache = settings
+
+    def update(self, **changes) -> Settings:
+        settings = self.get().model_copy(update=changes)
+        self.save(settings)
+        return settings
@@ -1,7 +1,11 @@
-from alu_gauntlet_helper.database import connect
+from alu_gauntlet_helper.database import transaction, ids_sql, ids_param, on_rollback
 from pydantic import BaseModel
 
-from alu_gauntlet_helper.services.maps import MapsService, Map
+from alu_gauntlet_helper.models import from_row
+from alu_gauntlet_helper.services.catalog_cache import CatalogCache
+from alu_gauntlet_helper.services.events import DataChangeBus, DataChange, ENTITY_MAPS, ENTITY_TRACKS
+from alu_gauntlet_helper.services.search_index import SearchMatch
+from alu_gauntlet_helper.services.maps import MapsService
 
 
 class Track(BaseModel):
@@ -15,76 +19,96 @@ class TrackView(Track):
 class TracksRepository:
     @staticmethod
     def parse(row):
-        return Track(**row) if row else None
-
-    def add(self, item: Track):
-        with connect() as conn:
-            return conn.execute("INSERT INTO tracks (map_id, name) VALUES (:map_id, :name)", item.model_dump()).lastrowid
+        return from_row(TrackView, row)
+
+    def upsert(self, item: Track) -> int:
+        with transaction() as conn:
+            return conn.execute("INSERT INTO tracks (map_id, name) VALUES (:map_id, :name)"
+                                " ON CONFLICT(map_id, name COLLATE NOCASE) DO UPDATE SET name = excluded.name"
+                                " RETURNING id", item.model_dump()).fetchone()[0]
+
+    def upsert_all(self, items: list[TrackView]):
+        with transaction() as conn:
+            conn.executemany("INSERT INTO maps (name) VALUES (:map_name) ON CONFLICT(name COLLATE NOCASE) DO NOTHING",
+                             [{"map_name": n} for n in dict.fromkeys(i.map_name for i in items if i.map_id <= 0)])
+            conn.executemany("INSERT INTO tracks (map_id, name)"
+                             " SELECT id, :name FROM maps"
+                             " WHERE id = :map_id OR (:map_id <= 0 AND name = :map_name COLLATE NOCASE)"
+                             " ON CONFLICT(map_id, name COLLATE NOCASE) DO NOTHING",
+                             [i.model_dump() for i in items])
 
     def get_by_name(self, map_id: int, name: str):
-        with connect() as conn:
+        with transaction() as conn:
             row = conn.execute("SELECT * FROM tracks WHERE map_id = :map_id AND name = :name COLLATE NOCASE LIMIT 1",
                                {"map_id": map_id, "name": name}).fetchone()
             return self.parse(row)
 
     def get_by_ids(self, ids):
-        ids_str = ", ".join(str(id) for id in ids)
-
-        with connect() as conn:
-            rows = conn.execute(f"SELECT * FROM tracks WHERE id in ({ids_str})").fetchall()
+        with transaction() as conn:
+            rows = conn.execute("SELECT t.*, COALESCE(m.name, 'Unknown Map') AS map_name"
+                                " FROM tracks t LEFT JOIN maps m ON t.map_id = m.id"
+                                f" WHERE t.id IN ({ids_sql()})", {"ids": ids_param(ids)}).fetchall()
             return [self.parse(row) for row in rows]
 
-    def autocomplete(self, query: str):
-        with (connect() as conn):
-            sql = "SELECT t.* FROM tracks t LEFT JOIN maps m ON t.map_id = m.id"
-            params = {}
-
-            if query:
-                sql += " WHERE t.name LIKE :query OR m.name LIKE :query"
-                params = {"query": f"%{query}%"}
-
-            rows = conn.execute(sql + " ORDER BY t.name LIMIT 100", params).fetchall()
+    def get_catalog(self):
+        with transaction() as conn:
+            rows = conn.execute("SELECT t.*, COALESCE(m.name, 'Unknown Map') AS map_name"
+                                " FROM tracks t LEFT JOIN maps m ON t.map_id = m.id").fetchall()
             return [self.parse(row) for row in rows]
 
     def update(self, item: Track):
-        with connect() as conn:
+        with transaction() as conn:
             conn.execute("UPDATE tracks SET map_id = :map_id, name = :name WHERE id = :id", item.model_dump())
 
 class TracksService:
-    def __init__(self, repo: TracksRepository, maps: MapsService):
+    def __init__(self, repo: TracksRepository, maps: MapsService, events: DataChangeBus):
         self.repo = repo
         self.maps = maps
+        self.events = events
+        self.cache = CatalogCache(repo.get_catalog, name_key=lambda t: (t.map_id, t.name.lower()),
+                                  search_keys=lambda t: [t.name, t.map_name])
+        self.events.subscribe(self.on_data_changed)
 
-    def to_views(self, items: list[Track]):
-        maps_ids = {t.map_id for t in items}
-        maps = self.maps.get_by_ids(maps_ids)
-        result = []
-        for i in items:
-            map_ = maps.get(i.map_id)
-            result.append(TrackView(
-                **i.model_dump(),
-                map_name=map_.name if map_ else "Unknown Map"
-            ))
-        return result
+    def on_data_changed(self, change: DataChange):
+        # track views carry the map name
+        if change.entity == ENTITY_MAPS:
+            self.cache.invalidate()
 
     def get_by_ids(self, ids: set[int]) -> dict[int, TrackView]:
         if not ids:
             return dict()
-        items = self.to_views(self.repo.get_by_ids(ids))
-        return {i.id: i for i in items}
+        return self.cache.get_by_ids(ids)
 
-    def autocomplete(self, query: str) -> list[TrackView]:
-        return self.to_views(self.repo.autocomplete(query.strip()))
+    def get_by_name(self, map_id: int, name: str) -> TrackView | None:
+        return self.cache.get_by_name((map_id, name.lower()))
 
-    def save(self, item: TrackView) -> int:
-        if item.map_id <= 0:
-            item.map_id = self.maps.save(Map(name=item.map_name))
+    def search(self, query: str) -> list[TrackView]:
+        return self.cache.search(query)
+
+    def match(self, query: str, limit: int | None = None) -> list[SearchMatch[TrackView]]:
+        return self.cache.match(query, limit)
 
-        if item.id <= 0:
-            existing = self.repo.get_by_name(item.map_id, item.name)
-            if not existing:
-                return self.repo.add(item)
-            item.id = existing.id
+    def save_all(self, items: list[TrackView]):
+        if items:
+            self.repo.upsert_all(items)
+            self.cache.invalidate()
+            self.maps.cache.invalidate()
+            self.events.emit(ENTITY_MAPS)
+            self.events.emit(ENTITY_TRACKS)
 
-        self.repo.update(item)
-        return item.id
\ No newline at end of file
+    def save(self, item: TrackView) -> int:
+        with transaction():
+            if item.map_id <= 0:
+                item.map_id = self.maps.get_or_add(item.map_name)
+
+            if item.id <= 0:
+                id_ = self.repo.upsert(item)
+            else:
+                self.repo.update(item)
+                id_ = item.id
+
+            on_rollback(self.cache.invalidate)
+            for track in self.repo.get_by_ids({id_}):
+                self.cache.put(track)
+            self.events.emit(ENTITY_TRACKS, {id_})
+        return id_
\ No newline at end of file
@@ -0,0 +1,38 @@
+import hashlib
+import os
+
+from PyQt6.QtGui import QImage
+
+from alu_gauntlet_helper.utils.pixmap_cache import cached_pixmap, thumbnail_path, MODE_COVER, MODE_FIT
+from alu_gauntlet_helper.utils.utils import pixmap_to_bytes
+
+
+def save_data_image(path: str, img: QImage, thumbnail_sizes: tuple[int, ...] = (), ext: str = "png") -> str:
+    # Files are named by content, so saving the same image again reuses the existing file.
+    data = pixmap_to_bytes(img, ext.upper())
+    result = os.path.join(path, hashlib.sha256(data).hexdigest() + "." + ext)
+    if not os.path.exists(result):
+        os.makedirs(path, exist_ok=True)
+        with open(result, "wb") as f:
+            f.write(data)
+
+    for size in thumbnail_sizes:
+        cached_pixmap(result, size, size, MODE_COVER, persist=True)
+    return result
+
+def remove_unreferenced_images(path: str, referenced: set[str], thumbnail_sizes: tuple[int, ...] = ()):
+    referenced = {os.path.normpath(p) for p in referenced if p}
+    if not os.path.isdir(path):
+        return
+
+    for name in os.listdir(path):
+        file = os.path.normpath(os.path.join(path, name))
+        if file in referenced:
+            continue
+        # thumbnail names depend on the file's stat, so they are resolved before it is removed;
+        # the thumbnail directory is shared with other cached pixmaps and is left alone otherwise
+        thumbnails = [thumbnail_path(file, size, size, mode) for size in thumbnail_sizes for mode in (MODE_COVER, MODE_FIT)]
+        os.remove(file)
+        for thumbnail in thumbnails:
+            if os.path.exists(thumbnail):
+                os.remove(thumbnail)
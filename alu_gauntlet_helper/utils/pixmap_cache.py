@@ -0,0 +1,49 @@
+import hashlib
+import os
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPixmapCache
+
+from alu_gauntlet_helper.utils.utils import pixmap_cover
+
+DATA_PATH_THUMBNAILS = "data/thumbnails"
+
+MODE_FIT = "fit"
+MODE_COVER = "cover"
+
+QPixmapCache.setCacheLimit(32 * 1024) # KB, least recently used pixmaps are evicted first
+
+
+def scale_pixmap(pixmap: QPixmap, w: int, h: int, mode: str) -> QPixmap:
+    if mode == MODE_COVER:
+        return pixmap_cover(pixmap, w=w, h=h)
+    return pixmap.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+def thumbnail_path(path: str, w: int, h: int, mode: str) -> str:
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{w}x{h}|{mode}"
+    return os.path.join(DATA_PATH_THUMBNAILS, hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+def cached_pixmap(path: str, w: int, h: int, mode: str = MODE_FIT, persist: bool = False) -> QPixmap:
+    key = f"{path}|{w}x{h}|{mode}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+
+    if not os.path.exists(path):
+        return QPixmap()
+
+    thumbnail = thumbnail_path(path, w, h, mode) if persist else None
+    if thumbnail and os.path.exists(thumbnail):
+        pixmap = QPixmap(thumbnail)
+    else:
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return pixmap
+        pixmap = scale_pixmap(pixmap, w, h, mode)
+        if thumbnail:
+            os.makedirs(DATA_PATH_THUMBNAILS, exist_ok=True)
+            pixmap.save(thumbnail)
+
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
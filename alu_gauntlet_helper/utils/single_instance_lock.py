@@ -1,7 +1,9 @@
+import os
+
 from PyQt6.QtNetwork import QLocalSocket, QLocalServer
 
 
-APP_ID = "alu_helper_instance"
+APP_ID = os.environ.get("ALU_HELPER_INSTANCE", "alu_helper_instance")
 
 def single_instance_lock(show_window):
     socket = QLocalSocket()
@@ -0,0 +1,80 @@
+import time
+from contextlib import contextmanager
+
+REPORT_FILE = "startup_profile.txt"
+CPROFILE_FILE = "startup.prof"
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.phases: list[tuple[str, float, float]] = [] # name, start, end relative to self.started
+        self.profile = None
+
+    def enable(self, cprofile: bool = False):
+        self.enabled = True
+        self.mark("imports")
+        if cprofile:
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def now(self) -> float:
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, self.now()))
+
+    def mark(self, name: str):
+        # a phase that lasted since the previous one ended
+        if self.enabled:
+            start = self.phases[-1][2] if self.phases else 0.0
+            self.phases.append((name, start, self.now()))
+
+    def report(self) -> str:
+        lines = [f"{'phase':<32}{'time':>10}{'at':>10}"]
+        for name, start, end in self.phases:
+            lines.append(f"{name:<32}{(end - start) * 1000:>7.1f} ms{end * 1000:>7.1f} ms")
+        total = self.phases[-1][2] if self.phases else 0.0
+        lines.append(f"{'total':<32}{total * 1000:>7.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+
+        if self.profile:
+            self.profile.disable()
+            self.profile.dump_stats(CPROFILE_FILE)
+
+        report = self.report()
+        print(report)
+        with open(REPORT_FILE, "w") as f:
+            f.write(report + "\n")
+
+STARTUP_PROFILER = StartupProfiler()
+
+
+def on_first_paint(widget, callback):
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                widget.removeEventFilter(self)
+                # children paint in the same pass, report once it is over
+                QTimer.singleShot(0, callback)
+            return False
+
+    paint_filter = FirstPaintFilter(widget)
+    widget.installEventFilter(paint_filter)
@@ -1,11 +1,10 @@
 import os
 import sys
-import uuid
 from datetime import datetime, timezone
 
 from PyQt6 import QtCore
 from PyQt6.QtCore import QIODeviceBase, Qt, QPointF
-from PyQt6.QtGui import QIcon, QPainter, QColor, QImage, QPixmap
+from PyQt6.QtGui import QIcon, QPainter, QColor, QPixmap
 
 
 def get_resource_path(relative_path: str) -> str:
@@ -17,15 +16,11 @@ def get_resource_path(relative_path: str) -> str:
 
 DATA_PATH_MAPS = "data/maps"
 
-def save_data_image(path: str, img: QImage, ext: str = "png") -> str:
-    os.makedirs(path, exist_ok=True)
-    result = os.path.join(path, uuid.uuid4().hex + "." + ext)
-    img.save(result)
-    return result
-
 LOCAL_TZ = datetime.now().astimezone().tzinfo
 
 def parse_utc_datetime(value):
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value, LOCAL_TZ)
     if isinstance(value, str):
         try:
             return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).astimezone(LOCAL_TZ)
@@ -1,12 +1,14 @@
 # gui/maps_tab.py
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QIntValidator
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
+from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
     QLabel
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
 from alu_gauntlet_helper.services.cars import Car
+from alu_gauntlet_helper.services.events import ENTITY_CARS
 from alu_gauntlet_helper.views.components.common import CLEAR_ON_ESC_FILTER
+from alu_gauntlet_helper.views.components.data_tab import DataTab
 from alu_gauntlet_helper.views.components.edit_dialog import EditDialog
 from alu_gauntlet_helper.views.components.validated_line_edit import ValidatedLineEdit
 
@@ -40,7 +42,9 @@ class CarDialog(EditDialog):
 
         return Car(id=self.item.id, name=name, rank=rank)
 
-class CarsTab(QWidget):
+class CarsTab(DataTab):
+    ENTITIES = (ENTITY_CARS,)
+
     def __init__(self):
         super().__init__()
 
@@ -68,22 +72,22 @@ class CarsTab(QWidget):
         layout.addLayout(top_layout)
         layout.addWidget(self.list_widget)
         self.setLayout(layout)
-        self.refresh()
 
     def refresh_debounce(self):
         self.debounce_timer.start(300)
 
     def refresh(self):
+        self.show_items(APP_CONTEXT.cars_service.search(self.query.text()))
+
+    def show_items(self, items):
         self.list_widget.clear()
-        for i in APP_CONTEXT.cars_service.autocomplete(self.query.text()):
+        for i in items:
             item = QListWidgetItem(f"{i.id}: {i.name} {i.rank}")
             item.setData(Qt.ItemDataRole.UserRole, i)
             self.list_widget.addItem(item)
 
     def on_add(self):
-        if CarDialog(item=Car(name=self.query.text().strip()), action=APP_CONTEXT.cars_service.save, parent=self).exec():
-            self.refresh()
+        CarDialog(item=Car(name=self.query.text().strip()), action=APP_CONTEXT.cars_service.save, parent=self).exec()
 
     def on_edit(self, item: QListWidgetItem):
-        if CarDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.cars_service.save, parent=self).exec():
-            self.refresh()
+        CarDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.cars_service.save, parent=self).exec()
@@ -1,9 +1,10 @@
 from typing import Callable
 
-from PyQt6.QtCore import Qt, QTimer, QObject, QEvent
+from PyQt6.QtCore import Qt, QTimer, QObject, QEvent, QRect
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtWidgets import QVBoxLayout, QLineEdit, QHBoxLayout, QLayout, QWidget, QListWidget, QListWidgetItem
+from PyQt6.QtWidgets import QVBoxLayout, QLineEdit, QHBoxLayout, QLayout
 
+from alu_gauntlet_helper.utils.pixmap_cache import cached_pixmap
 from alu_gauntlet_helper.utils.utils import get_resource_path
 
 
@@ -36,19 +37,6 @@ class InputDebounce:
         self.timer.start(self.debounce_time)
 
 
-class ListItemWidget(QWidget):
-    def __init__(self, item, parent=None):
-        super().__init__(parent)
-        self.item = item
-
-    def add_to_list(self, list_widget: QListWidget):
-        list_item = QListWidgetItem(list_widget)
-        list_item.setData(Qt.ItemDataRole.UserRole, self.item)
-        list_item.setSizeHint(self.sizeHint())
-
-        list_widget.addItem(list_item)
-        list_widget.setItemWidget(list_item, self)
-
 class ClearOnEscEventFilter(QObject):
     def eventFilter(self, obj, event):
         if isinstance(obj, QLineEdit) and event.type() == QEvent.Type.KeyPress:
@@ -82,8 +70,18 @@ def vbox(items, spacing=None, alignment=None) -> QVBoxLayout:
 def hbox(items, spacing=None, alignment=None) -> QHBoxLayout:
     return add_contents(QHBoxLayout(), items, spacing=spacing, alignment=alignment)
 
+def split_columns(rect: QRect, stretches: tuple[int, ...], spacing: int) -> list[QRect]:
+    width = rect.width() - spacing * (len(stretches) - 1)
+    total = sum(stretches)
+    result = []
+    x = rect.left()
+    for stretch in stretches:
+        w = width * stretch // total
+        result.append(QRect(x, rect.top(), w, rect.height()))
+        x += w + spacing
+    return result
+
 def res_to_pixmap(path: str, size: int | None = None):
-    q_pixmap = QPixmap(get_resource_path(path))
     if size:
-        q_pixmap = q_pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-    return q_pixmap
\ No newline at end of file
+        return cached_pixmap(get_resource_path(path), size, size)
+    return QPixmap(get_resource_path(path))
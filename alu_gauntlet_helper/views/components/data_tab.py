@@ -0,0 +1,38 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget
+
+from alu_gauntlet_helper.app_context import APP_CONTEXT
+from alu_gauntlet_helper.services.events import DataChange
+
+
+class DataTab(QWidget):
+    ENTITIES: tuple[str, ...] = ()
+
+    def __init__(self):
+        super().__init__()
+        # filled on first show
+        self.dirty = True
+        APP_CONTEXT.events.subscribe(self.on_data_changed)
+
+    def on_data_changed(self, change: DataChange):
+        if change.entity in self.ENTITIES:
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        # hidden tabs wait until they are shown again
+        self.dirty = True
+        if self.isVisible():
+            self.refresh_if_dirty()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # let the tab paint before it queries
+        QTimer.singleShot(0, self.refresh_if_dirty)
+
+    def refresh_if_dirty(self):
+        if self.dirty:
+            self.dirty = False
+            self.refresh()
+
+    def refresh(self):
+        raise NotImplementedError
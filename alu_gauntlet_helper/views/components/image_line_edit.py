@@ -2,17 +2,21 @@ from PyQt6.QtCore import Qt, QEvent, QSize
 from PyQt6.QtGui import QPixmap, QGuiApplication, QImage, QCursor
 from PyQt6.QtWidgets import QWidget, QLineEdit, QLabel, QPushButton, QHBoxLayout, QFileDialog, QStyle
 
+from alu_gauntlet_helper.utils.pixmap_cache import cached_pixmap, MODE_COVER
 from alu_gauntlet_helper.utils.utils import pixmap_cover
 from alu_gauntlet_helper.views.components.common import add_contents, vbox
 
 
 class ImageLineEdit(QWidget):
-    def __init__(self, image: QImage | None = None):
+    PREVIEW_SIZE = 80
+
+    def __init__(self, path: str = ""):
         super().__init__()
         self._image = None
+        self._path = ""
 
         self.preview = QLabel()
-        self.preview.setFixedSize(80, 80)
+        self.preview.setFixedSize(self.PREVIEW_SIZE, self.PREVIEW_SIZE)
         self.preview.setStyleSheet("border: 1px solid #aaa;")
         self.preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -40,7 +44,7 @@ class ImageLineEdit(QWidget):
         right_vbox = vbox([self.line, or_label, self.select_button], spacing=0)
         add_contents(QHBoxLayout(self), [self.preview, right_vbox])
 
-        self.set_image(image)
+        self.set_path(path)
 
     def eventFilter(self, obj, event):
         if obj is self.line and event.type() == QEvent.Type.KeyPress:
@@ -79,8 +83,19 @@ class ImageLineEdit(QWidget):
             self.set_image(QImage(path))
             self.line.setText(path)
 
+    def set_path(self, path: str):
+        pixmap = cached_pixmap(path, self.PREVIEW_SIZE, self.PREVIEW_SIZE, MODE_COVER, persist=True) if path else None
+        if pixmap and not pixmap.isNull():
+            self._image = None
+            self._path = path
+            self.preview.setPixmap(pixmap)
+            self.clear_button.setVisible(True)
+        else:
+            self.set_image(None)
+
     def set_image(self, img: QImage | None):
         self._image = img
+        self._path = ""
         if img:
             self.preview.setPixmap(pixmap_cover(QPixmap.fromImage(img), w=self.preview.width(), h=self.preview.height()))
             self.clear_button.setVisible(True)
@@ -90,3 +105,7 @@ class ImageLineEdit(QWidget):
 
     def get_image(self) -> QImage | None:
         return self._image
+
+    def get_path(self) -> str:
+        # set only while the stored image is shown unchanged
+        return self._path
@@ -1,4 +1,4 @@
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtWidgets import QLineEdit, QCompleter
 
@@ -15,16 +15,11 @@ class ItemCompleter(QCompleter):
 
         self._model = QStandardItemModel(self)
         self.setModel(self._model)
-        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+        # suggestions are already ranked by the search index, the popup shows them as is
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
         self.activated.connect(self.on_completer_activated) # type: ignore
         self.highlighted.connect(self.on_completer_activated) # type: ignore
 
-        self.debounce_timer = QTimer(self)
-        self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.timeout.connect(self.update_completer) # type: ignore
-
         self.input_.textEdited.connect(self.on_text_changed)
         if not allow_custom_text:
             self.input_.editingFinished.connect(self.on_editing_finished)
@@ -47,11 +42,10 @@ class ItemCompleter(QCompleter):
         self.selected_item = None
         if self.selected_listener:
             self.selected_listener(None)
-        self.debounce_timer.start(300)
+        self.update_completer()
 
     def on_completer_activated(self, text):
         self.input_.setText(text)
-        self.debounce_timer.stop()
 
         index = self.popup().currentIndex()
         if index.isValid():
@@ -65,8 +59,9 @@ class ItemCompleter(QCompleter):
         except RuntimeError:
             return
 
-        items = self.autocomplete(query)
+        self.show_items(self.autocomplete(query))
 
+    def show_items(self, items):
         self._model.clear()
         for i in items:
             item = QStandardItem(self.presentation(i))
@@ -0,0 +1,58 @@
+from typing import Callable
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class ItemListModel(QAbstractListModel):
+    def __init__(self, presentation: Callable | None = None, tooltip: Callable | None = None, parent=None):
+        super().__init__(parent)
+        self.presentation = presentation
+        self.tooltip = tooltip
+        self._items = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return item
+        if role == Qt.ItemDataRole.DisplayRole and self.presentation:
+            return self.presentation(item)
+        if role == Qt.ItemDataRole.ToolTipRole and self.tooltip:
+            return self.tooltip(item)
+        return None
+
+    def items(self) -> list:
+        return self._items
+
+    def set_items(self, items: list):
+        self.beginResetModel()
+        self._items = list(items)
+        self.endResetModel()
+
+    def append_items(self, items: list):
+        if not items:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        self._items.extend(items)
+        self.endInsertRows()
+
+    def insert_item(self, row: int, item):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self.endInsertRows()
+
+    def replace_item(self, row: int, item):
+        self._items[row] = item
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_item(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self.endRemoveRows()
@@ -0,0 +1,27 @@
+from typing import Callable
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from alu_gauntlet_helper.utils.startup_profiler import STARTUP_PROFILER
+
+
+class LazyTab(QWidget):
+    def __init__(self, factory: Callable[[], QWidget], name: str):
+        super().__init__()
+        self.factory = factory
+        self.name = name
+        self.widget: QWidget | None = None
+        self.setLayout(QVBoxLayout())
+        self.layout().setContentsMargins(0, 0, 0, 0)
+
+    def ensure_created(self) -> QWidget:
+        if self.widget is None:
+            with STARTUP_PROFILER.phase(f"tab {self.name}"):
+                self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        # tabs are built the first time they are shown, a hidden window builds none
+        self.ensure_created()
+        super().showEvent(event)
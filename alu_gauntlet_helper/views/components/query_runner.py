@@ -0,0 +1,60 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# One long-lived worker thread: it keeps its own thread-bound SQLite connection,
+# and queries from the GUI are served in the order they were requested.
+QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-worker")
+
+
+class QueryRunner(QObject):
+    finished = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.finished.connect(self.on_finished) # type: ignore
+        self.failed.connect(self.on_failed) # type: ignore
+
+    def submit(self, query: Callable, on_result: Callable, *args, on_error: Callable | None = None):
+        self.generation += 1
+        QUERY_EXECUTOR.submit(self.run, self.generation, query, on_result, on_error, args)
+
+    def cancel(self):
+        self.generation += 1
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def run(self, generation: int, query: Callable, on_result: Callable, on_error: Callable | None, args):
+        if not self.is_current(generation):
+            return
+
+        try:
+            result = query(*args)
+        except Exception:
+            traceback.print_exc()
+            if on_error:
+                self.emit(self.failed, generation, on_error)
+            return
+
+        self.emit(self.finished, generation, on_result, result)
+
+    @staticmethod
+    def emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # the receiver was deleted while the query was running
+            pass
+
+    def on_finished(self, generation: int, on_result: Callable, result):
+        if self.is_current(generation):
+            on_result(result)
+
+    def on_failed(self, generation: int, on_error: Callable):
+        if self.is_current(generation):
+            on_error()
@@ -1,12 +1,14 @@
 import base64
 
-from PyQt6.QtCore import QByteArray, QUrl
+from PyQt6.QtCore import QByteArray, QUrl, QTimer
 from PyQt6.QtGui import QIcon, QAction, QDesktopServices
 from PyQt6.QtWidgets import QTabWidget, QMainWindow, QSystemTrayIcon, QMenu, QApplication, QStyle
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
 from alu_gauntlet_helper.utils.utils import get_resource_path, create_badged_icon
 from alu_gauntlet_helper.views.cars_tab import CarsTab
+from alu_gauntlet_helper.views.components.data_tab import DataTab
+from alu_gauntlet_helper.views.components.lazy_tab import LazyTab
 from alu_gauntlet_helper.views.maps_tab import MapsTab
 from alu_gauntlet_helper.views.races_tab import RacesTab
 from alu_gauntlet_helper.views.recognize_races_tab import RecognizeRacesTab
@@ -16,31 +18,34 @@ from alu_gauntlet_helper.views.tracks_tab import TracksTab
 
 class MainWindow(QMainWindow):
     tray_icon: QSystemTrayIcon | None = None
+    WINDOW_STATE_SAVE_DELAY = 1000
 
     def __init__(self):
         super().__init__()
+        # moving or resizing fires many events, the window state is written once they settle
+        self.window_state_timer = QTimer(self)
+        self.window_state_timer.setSingleShot(True)
+        self.window_state_timer.timeout.connect(self.save_window_state) # type: ignore
+        QApplication.instance().aboutToQuit.connect(self.flush_window_state) # type: ignore
+
         self.setWindowTitle("ALU Gauntlet Helper")
         self.setWindowIcon(QIcon(get_resource_path("logo.ico")))
         self.setMinimumSize(500, 600)
         self.restore_window_state()
         self.refresh_tray_icon(APP_CONTEXT.settings.get().show_tray_icon)
 
-        self.recognize_races_tab = RecognizeRacesTab()
-        self.races_tab = RacesTab()
-        self.tracks_tab = TracksTab()
-        self.maps_tab = MapsTab()
-        self.cars_tab = CarsTab()
-        self.settings_tab = SettingsTab(refresh_tray_icon=self.refresh_tray_icon)
-
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
         self.tabs.currentChanged.connect(self.tab_selected) # type: ignore
-        self.tabs.addTab(self.recognize_races_tab, "Recognize races")
-        self.tabs.addTab(self.races_tab, "Races")
-        self.tabs.addTab(self.tracks_tab, "Tracks")
-        self.tabs.addTab(self.maps_tab, "Maps")
-        self.tabs.addTab(self.cars_tab, "Cars")
-        self.tabs.addTab(self.settings_tab, "Settings")
+        self.add_tab(RecognizeRacesTab, "Recognize races")
+        self.add_tab(RacesTab, "Races")
+        self.add_tab(TracksTab, "Tracks")
+        self.add_tab(MapsTab, "Maps")
+        self.add_tab(CarsTab, "Cars")
+        self.add_tab(lambda: SettingsTab(refresh_tray_icon=self.refresh_tray_icon), "Settings")
+
+    def add_tab(self, factory, name: str):
+        self.tabs.addTab(LazyTab(factory, name), name)
 
     def refresh_tray_icon(self, show_tray_icon: bool):
         if show_tray_icon:
@@ -69,12 +74,21 @@ class MainWindow(QMainWindow):
             self.tray_icon = None
 
     def tab_selected(self, idx):
-        tab = self.tabs.widget(idx)
-        if hasattr(tab, 'refresh'):
+        tab = self.tabs.widget(idx).widget
+        # tabs not built yet are filled when created, data tabs refresh themselves when shown
+        if tab and hasattr(tab, 'refresh') and not isinstance(tab, DataTab):
             tab.refresh()
 
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.schedule_window_state_save()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_window_state_save()
+
     def closeEvent(self, event):
-        self.save_window_state()
+        self.flush_window_state()
         if self.tray_icon and APP_CONTEXT.settings.get().close_to_tray:
             event.ignore()
             self.hide()
@@ -89,11 +103,19 @@ class MainWindow(QMainWindow):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
             self.show_window()
 
+    def schedule_window_state_save(self):
+        if self.isVisible():
+            self.window_state_timer.start(self.WINDOW_STATE_SAVE_DELAY)
+
+    def flush_window_state(self):
+        self.window_state_timer.stop()
+        self.save_window_state()
+
     def save_window_state(self):
-        settings = APP_CONTEXT.settings.get()
-        settings.window_geometry = base64.b64encode(self.saveGeometry().data()).decode()
-        settings.window_state = base64.b64encode(self.saveState().data()).decode()
-        APP_CONTEXT.settings.save(settings)
+        APP_CONTEXT.settings.update(
+            window_geometry=base64.b64encode(self.saveGeometry().data()).decode(),
+            window_state=base64.b64encode(self.saveState().data()).decode()
+        )
 
     def restore_window_state(self):
         settings = APP_CONTEXT.settings.get()
@@ -1,15 +1,20 @@
 # gui/maps_tab.py
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QPixmap, QImage, QFont
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
-    QLabel, QFormLayout
+from PyQt6.QtCore import QTimer, Qt, QRect, QSize, QModelIndex
+from PyQt6.QtGui import QFont, QColor, QPalette
+from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QListView, QLineEdit, QHBoxLayout, QFormLayout, \
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
+from alu_gauntlet_helper.services.events import ENTITY_MAPS
 from alu_gauntlet_helper.services.maps import Map
-from alu_gauntlet_helper.utils.utils import save_data_image, DATA_PATH_MAPS, pixmap_cover
-from alu_gauntlet_helper.views.components.common import CLEAR_ON_ESC_FILTER, ListItemWidget
+from alu_gauntlet_helper.utils.image_store import save_data_image, remove_unreferenced_images
+from alu_gauntlet_helper.utils.pixmap_cache import cached_pixmap, MODE_COVER
+from alu_gauntlet_helper.utils.utils import DATA_PATH_MAPS
+from alu_gauntlet_helper.views.components.common import CLEAR_ON_ESC_FILTER
+from alu_gauntlet_helper.views.components.data_tab import DataTab
 from alu_gauntlet_helper.views.components.image_line_edit import ImageLineEdit
 from alu_gauntlet_helper.views.components.edit_dialog import EditDialog
+from alu_gauntlet_helper.views.components.item_list_model import ItemListModel
 from alu_gauntlet_helper.views.components.validated_line_edit import ValidatedLineEdit
 
 
@@ -17,8 +22,7 @@ class MapDialog(EditDialog):
     def __init__(self, item: Map, action, parent=None):
         self.item = item
         self.name_edit = ValidatedLineEdit(item.name)
-        icon = QImage(item.icon) if item.icon else None
-        self.icon_edit = ImageLineEdit(icon)
+        self.icon_edit = ImageLineEdit(item.icon)
 
         super().__init__(action, parent)
         self.setWindowTitle("Edit Map" if item.id else "Add Map")
@@ -33,45 +37,58 @@ class MapDialog(EditDialog):
     def prepare_item(self):
         name = self.name_edit.text()
         icon = self.icon_edit.get_image()
-        icon_path = ""
+        icon_path = self.icon_edit.get_path()
 
         if not name:
             self.name_edit.set_error()
             return None
 
         if icon:
-            icon_path = save_data_image(DATA_PATH_MAPS, icon)
+            icon_path = save_data_image(DATA_PATH_MAPS, icon, THUMBNAIL_SIZES)
 
         return Map(id=self.item.id, name=name, icon = icon_path)
 
 
-class MapListWidget(ListItemWidget):
-    def __init__(self, item: Map, parent=None):
-        super().__init__(item, parent)
-        self.map_icon = QLabel()
-        self.map_icon.setFixedSize(64, 64)
-        self.map_icon.setStyleSheet("""
-            border: 1px solid #aaa;
-            background-color: #271A62;
-        """)
-        self.map_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
+class MapItemDelegate(QStyledItemDelegate):
+    PADDING = 2
+    SPACING = 8
+    ICON_SIZE = 64
+    ICON_BORDER = QColor("#aaa")
+    ICON_BACKGROUND = QColor("#271A62")
 
+    def sizeHint(self, option, index):
+        return QSize(0, self.ICON_SIZE + 2 * self.PADDING)
+
+    def paint(self, painter, option, index):
+        item: Map = index.data(Qt.ItemDataRole.UserRole)
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        icon_rect = QRect(opt.rect.left() + self.PADDING, opt.rect.top() + self.PADDING, self.ICON_SIZE, self.ICON_SIZE)
+        painter.fillRect(icon_rect, self.ICON_BACKGROUND)
         if item.icon:
-            self.map_icon.setPixmap(pixmap_cover(QPixmap(item.icon), w=self.map_icon.width(), h=self.map_icon.height()))
-        self.map_label = QLabel(item.name)
+            painter.drawPixmap(icon_rect, cached_pixmap(item.icon, self.ICON_SIZE, self.ICON_SIZE, MODE_COVER, persist=True))
+        painter.setPen(self.ICON_BORDER)
+        painter.drawRect(icon_rect.adjusted(0, 0, -1, -1))
 
-        name_font = QFont()
-        name_font.setPointSize(self.font().pointSize() + 4)
-        self.map_label.setFont(name_font)
+        selected = opt.state & QStyle.StateFlag.State_Selected
+        painter.setPen(opt.palette.color(QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text))
+        name_font = QFont(opt.font)
+        name_font.setPointSize(opt.font.pointSize() + 4)
+        painter.setFont(name_font)
+        name_rect = opt.rect.adjusted(self.PADDING + self.ICON_SIZE + self.SPACING, 0, -self.PADDING, 0)
+        name = painter.fontMetrics().elidedText(item.name, Qt.TextElideMode.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, name)
+        painter.restore()
 
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(2, 2, 2, 2)
-        self.layout.setSpacing(8)
-        self.layout.addWidget(self.map_icon)
-        self.layout.addWidget(self.map_label, stretch=1)
-        self.setLayout(self.layout)
+THUMBNAIL_SIZES = (MapItemDelegate.ICON_SIZE, ImageLineEdit.PREVIEW_SIZE)
+
+class MapsTab(DataTab):
+    ENTITIES = (ENTITY_MAPS,)
 
-class MapsTab(QWidget):
     def __init__(self):
         super().__init__()
 
@@ -84,8 +101,12 @@ class MapsTab(QWidget):
         self.add_button = QPushButton("Add")
         self.add_button.clicked.connect(self.on_add) # type: ignore
 
-        self.list_widget = QListWidget()
-        self.list_widget.itemDoubleClicked.connect(self.on_edit) # type: ignore
+        self.list_model = ItemListModel()
+        self.list_view = QListView()
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(MapItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.doubleClicked.connect(self.on_edit) # type: ignore
 
         self.debounce_timer = QTimer()
         self.debounce_timer.setSingleShot(True)
@@ -97,22 +118,22 @@ class MapsTab(QWidget):
 
         layout = QVBoxLayout()
         layout.addLayout(top_layout)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
         self.setLayout(layout)
-        self.refresh()
 
     def refresh_debounce(self):
         self.debounce_timer.start(300)
 
     def refresh(self):
-        self.list_widget.clear()
-        for i in APP_CONTEXT.maps_service.autocomplete(self.query.text()):
-            MapListWidget(i).add_to_list(self.list_widget)
+        self.list_model.set_items(APP_CONTEXT.maps_service.search(self.query.text()))
+
+    def on_saved(self):
+        remove_unreferenced_images(DATA_PATH_MAPS, APP_CONTEXT.maps_service.get_icons(), THUMBNAIL_SIZES)
 
     def on_add(self):
         if MapDialog(item=Map(name=self.query.text().strip()), action=APP_CONTEXT.maps_service.save, parent=self).exec():
-            self.refresh()
+            self.on_saved()
 
-    def on_edit(self, item: QListWidgetItem):
-        if MapDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.maps_service.save, parent=self).exec():
-            self.refresh()
+    def on_edit(self, index: QModelIndex):
+        if MapDialog(item=index.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.maps_service.save, parent=self).exec():
+            self.on_saved()
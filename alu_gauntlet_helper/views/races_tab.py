@@ -1,16 +1,21 @@
 # gui/maps_tab.py
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIntValidator, QFont
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
-    QLabel, QCheckBox, QTextEdit, QFormLayout
+from PyQt6.QtCore import Qt, QRect, QSize, QModelIndex
+from PyQt6.QtGui import QIntValidator, QFont, QPalette
+from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QListView, QLineEdit, QHBoxLayout, QCheckBox, \
+    QTextEdit, QFormLayout, QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
-from alu_gauntlet_helper.services.races import RaceView
+from alu_gauntlet_helper.models import PageResult
+from alu_gauntlet_helper.services.events import DataChange, ENTITY_MAPS, ENTITY_TRACKS, ENTITY_CARS, ENTITY_RACES
+from alu_gauntlet_helper.services.races import RaceView, RaceFilter
 from alu_gauntlet_helper.services.tracks import TrackView
 from alu_gauntlet_helper.utils.utils import format_time, time_format_regex, parse_time
-from alu_gauntlet_helper.views.components.common import InputDebounce, CLEAR_ON_ESC_FILTER, vbox, res_to_pixmap, hbox, \
-    ListItemWidget
+from alu_gauntlet_helper.views.components.common import InputDebounce, CLEAR_ON_ESC_FILTER, res_to_pixmap, \
+    split_columns
+from alu_gauntlet_helper.views.components.data_tab import DataTab
 from alu_gauntlet_helper.views.components.edit_dialog import EditDialog
+from alu_gauntlet_helper.views.components.item_list_model import ItemListModel
+from alu_gauntlet_helper.views.components.query_runner import QueryRunner
 from alu_gauntlet_helper.views.components.validated_line_edit import ValidatedLineEdit
 from alu_gauntlet_helper.views.components.item_completer import ItemCompleter
 
@@ -30,7 +35,7 @@ class RaceDialog(EditDialog):
 
         self.tracks_completer = ItemCompleter(
             self.track_edit.get_input(),
-            autocomplete=APP_CONTEXT.tracks_service.autocomplete,
+            autocomplete=APP_CONTEXT.tracks_service.search,
             presentation=lambda i: f"{i.map_name} - {i.name}",
             allow_custom_text=False
         )
@@ -38,7 +43,7 @@ class RaceDialog(EditDialog):
 
         self.cars_completer = ItemCompleter(
             self.car_edit.get_input(),
-            autocomplete=APP_CONTEXT.cars_service.autocomplete,
+            autocomplete=APP_CONTEXT.cars_service.search,
             presentation=lambda i: i.name,
             selected_listener=self.on_car_selected
         )
@@ -88,40 +93,67 @@ class RaceDialog(EditDialog):
                         time=time, bad_timing=bad_timing, note=note)
 
 
-class RaceListWidget(ListItemWidget):
-    def __init__(self, race: RaceView, parent=None):
-        super().__init__(race, parent)
-        self.map_label = QLabel(race.map_name)
-        self.track_label = QLabel(race.track_name)
-        self.car_label = QLabel(race.car_name)
-        self.rank_label = QLabel(str(race.rank))
+class RaceItemDelegate(QStyledItemDelegate):
+    PADDING = 6
+    SPACING = 6
+    ICON_SIZE = 18
+    COLUMNS = (20, 20, 12, 6, 14)
 
-        time_font = QFont()
-        # time_font.setBold(True)
-        time_font.setPointSize(self.font().pointSize() + 4)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bad_timing_icon = res_to_pixmap("icons/dislike.png", self.ICON_SIZE)
+        self.info_icon = res_to_pixmap("icons/info.png", self.ICON_SIZE)
 
-        self.time_label = QLabel(format_time(race.time))
-        self.time_label.setFont(time_font)
-        self.created_at_label = QLabel(race.created_at.strftime("%d.%m.%Y %H:%M:%S"))
+    def sizeHint(self, option, index):
+        return QSize(0, 2 * option.fontMetrics.height() + 2 * self.PADDING)
 
-        self.bad_timing_label = QLabel()
-        if race.bad_timing:
-            self.bad_timing_label.setPixmap(res_to_pixmap("icons/dislike.png", 18))
+    def paint(self, painter, option, index):
+        race: RaceView = index.data(Qt.ItemDataRole.UserRole)
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        selected = opt.state & QStyle.StateFlag.State_Selected
+        painter.setPen(opt.palette.color(QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text))
+
+        content = opt.rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        track_rect, car_rect, time_rect, icons_rect, created_at_rect = split_columns(content, self.COLUMNS, self.SPACING)
 
-        self.info_label = QLabel()
+        self.draw_two_lines(painter, track_rect, race.map_name, race.track_name)
+        self.draw_two_lines(painter, car_rect, race.car_name, str(race.rank))
+
+        time_font = QFont(opt.font)
+        time_font.setPointSize(opt.font.pointSize() + 4)
+        painter.setFont(time_font)
+        painter.drawText(time_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, format_time(race.time))
+        painter.setFont(opt.font)
+
+        icon_y = icons_rect.top() + (icons_rect.height() - self.ICON_SIZE) // 2
+        if race.bad_timing:
+            painter.drawPixmap(icons_rect.left(), icon_y, self.bad_timing_icon)
         if race.note:
-            self.info_label.setPixmap(res_to_pixmap("icons/info.png", 18))
-            self.info_label.setToolTip(race.note)
-
-        self.layout = QHBoxLayout(self)
-        self.layout.addLayout(vbox([self.map_label, self.track_label], spacing=0), stretch=20)
-        self.layout.addLayout(vbox([self.car_label, self.rank_label], spacing=0), stretch=20)
-        self.layout.addWidget(self.time_label, stretch=10)
-        self.layout.addLayout(hbox([self.bad_timing_label, self.info_label], spacing=0), stretch=8)
-        self.layout.addWidget(self.created_at_label, stretch=10)
-        self.setLayout(self.layout)
-
-class RacesTab(QWidget):
+            painter.drawPixmap(icons_rect.left() + self.ICON_SIZE, icon_y, self.info_icon)
+
+        created_at = race.created_at.strftime("%d.%m.%Y %H:%M:%S") if race.created_at else ""
+        self.draw_text(painter, created_at_rect, created_at)
+        painter.restore()
+
+    @staticmethod
+    def draw_text(painter, rect: QRect, text: str):
+        text = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, rect.width())
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+    def draw_two_lines(self, painter, rect: QRect, first: str, second: str):
+        half = rect.height() // 2
+        self.draw_text(painter, QRect(rect.left(), rect.top(), rect.width(), half), first)
+        self.draw_text(painter, QRect(rect.left(), rect.top() + half, rect.width(), rect.height() - half), second)
+
+class RacesTab(DataTab):
+    # rows show map, track and car names
+    ENTITIES = (ENTITY_MAPS, ENTITY_TRACKS, ENTITY_CARS)
+
     def __init__(self):
         super().__init__()
 
@@ -140,8 +172,23 @@ class RacesTab(QWidget):
         self.add_button = QPushButton("Add")
         self.add_button.clicked.connect(self.on_add) # type: ignore
 
-        self.list_widget = QListWidget()
-        self.list_widget.itemDoubleClicked.connect(self.on_edit) # type: ignore
+        self.list_model = ItemListModel(tooltip=lambda race: race.note or None)
+        self.list_view = QListView()
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(RaceItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.doubleClicked.connect(self.on_edit) # type: ignore
+        self.list_view.verticalScrollBar().valueChanged.connect(self.check_load_more) # type: ignore
+        self.list_view.verticalScrollBar().rangeChanged.connect(self.check_load_more) # type: ignore
+
+        self.query_runner = QueryRunner(self)
+        self.rows_runner = QueryRunner(self)
+        self.pending_ids: set[int] = set()
+        self.track_filter = ""
+        self.car_filter = ""
+        self.race_filter = RaceFilter()
+        self.total = 0
+        self.loading = False
 
         top_layout = QHBoxLayout()
         top_layout.addWidget(self.track_query)
@@ -150,21 +197,112 @@ class RacesTab(QWidget):
 
         layout = QVBoxLayout()
         layout.addLayout(top_layout)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
         self.setLayout(layout)
-        self.refresh()
 
     def refresh(self):
-        self.list_widget.clear()
-        track_query = self.track_query.text().strip()
-        car_query = self.car_query.text().strip()
-        for i in APP_CONTEXT.races_service.get_all(track_query, car_query):
-            RaceListWidget(i).add_to_list(self.list_widget)
+        self.track_filter = self.track_query.text().strip()
+        self.car_filter = self.car_query.text().strip()
+        self.race_filter = APP_CONTEXT.races_service.filter(self.track_filter, self.car_filter)
+        self.loading = True
+        # the first page brings every row up to date
+        self.rows_runner.cancel()
+        self.pending_ids.clear()
+        self.query_runner.submit(APP_CONTEXT.races_service.get_page, self.show_page, self.race_filter,
+                                 on_error=self.on_load_failed)
+
+    def show_page(self, page: PageResult[RaceView]):
+        self.total = page.total
+        self.loading = False
+        self.list_model.set_items(page.items)
+
+    def check_load_more(self):
+        if self.loading or self.list_model.rowCount() >= self.total:
+            return
+
+        scroll_bar = self.list_view.verticalScrollBar()
+        if scroll_bar.value() >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.loading = True
+            items = self.list_model.items()
+            self.query_runner.submit(APP_CONTEXT.races_service.get_page, self.append_page,
+                                     self.race_filter, items[-1] if items else None,
+                                     on_error=self.on_load_failed)
+
+    def append_page(self, page: PageResult[RaceView]):
+        self.loading = False
+        self.list_model.append_items(page.items)
+
+    def on_load_failed(self):
+        # the next scroll retries the page
+        self.loading = False
+
+    def on_data_changed(self, change: DataChange):
+        if change.entity not in self.ENTITIES + (ENTITY_RACES,):
+            return
+        if not change.ids:
+            self.mark_dirty()
+        elif change.entity == ENTITY_RACES:
+            if self.isVisible():
+                self.update_rows(change.ids)
+            else:
+                self.mark_dirty()
+        elif self.race_filter != APP_CONTEXT.races_service.filter(self.track_filter, self.car_filter):
+            # an added or renamed item entered or left the filtered list
+            self.mark_dirty()
+        else:
+            self.update_names()
+
+    def update_names(self):
+        # saving a race upserts its car and track, which usually leaves their names as they were
+        items = self.list_model.items()
+        tracks = APP_CONTEXT.tracks_service.get_by_ids({r.track_id for r in items})
+        cars = APP_CONTEXT.cars_service.get_by_ids({r.car_id for r in items})
+
+        changed = []
+        for row, race in enumerate(items):
+            track = tracks.get(race.track_id)
+            car = cars.get(race.car_id)
+            names = {"map_name": track.map_name if track else race.map_name,
+                     "track_name": track.name if track else race.track_name,
+                     "car_name": car.name if car else race.car_name}
+            if any(getattr(race, key) != value for key, value in names.items()):
+                changed.append((row, race.model_copy(update=names)))
+        for row, race in changed:
+            self.list_model.replace_item(row, race)
+
+    def update_rows(self, ids: frozenset[int]):
+        # a newer lookup drops the result of the previous one, so it asks for its ids too
+        self.pending_ids |= ids
+        ids = frozenset(self.pending_ids)
+        self.rows_runner.submit(APP_CONTEXT.races_service.get_views, lambda races: self.show_rows(ids, races),
+                                ids, self.race_filter, on_error=self.mark_dirty)
+
+    def show_rows(self, ids: frozenset[int], races: list[RaceView]):
+        self.pending_ids -= ids
+        by_id = {race.id: race for race in races}
+        for id_ in ids:
+            self.update_row(id_, by_id.get(id_))
+
+    def update_row(self, id_: int, race: RaceView | None):
+        items = self.list_model.items()
+        row = next((i for i, r in enumerate(items) if r.id == id_), -1)
+        if row >= 0:
+            if race:
+                self.list_model.replace_item(row, race)
+            else:
+                self.list_model.remove_item(row)
+                self.total -= 1
+        elif race:
+            # newest first; a race past the loaded pages will come with the next page
+            key = (race.created_at, race.id)
+            row = next((i for i, r in enumerate(items) if (r.created_at, r.id) < key), len(items))
+            if row < len(items) or len(items) >= self.total:
+                self.list_model.insert_item(row, race)
+            # counted even when it waits for a later page, so that page still gets loaded
+            self.total += 1
 
     def on_add(self):
-        if RaceDialog(item=RaceView(), action=APP_CONTEXT.races_service.save, parent=self).exec():
-            self.refresh()
+        RaceDialog(item=RaceView(), action=APP_CONTEXT.races_service.save, parent=self).exec()
 
-    def on_edit(self, item: QListWidgetItem):
-        if RaceDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.races_service.save, parent=self).exec():
-            self.refresh()
+    def on_edit(self, index: QModelIndex):
+        RaceDialog(item=index.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.races_service.save, parent=self).exec()
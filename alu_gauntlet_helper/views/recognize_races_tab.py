@@ -1,13 +1,10 @@
-import cv2
-import numpy as np
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QCheckBox, QFormLayout, QLabel, QFileDialog
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
 from alu_gauntlet_helper.utils.utils import pixmap_to_bytes
-from alu_gauntlet_helper.screen_recognition.recognition import find_rectangles, find_race_boxes, \
-    recognize_text_in_rectangle
+from alu_gauntlet_helper.screen_recognition.recognition import find_race_boxes, warm_up
 
 
 class RecognizeRacesTab(QWidget):
@@ -31,6 +28,9 @@ class RecognizeRacesTab(QWidget):
         self.setLayout(layout)
 
     def load_image(self):
+        # the imaging stack loads in the background while the file dialog is open,
+        # not during startup where it would compete with the first paint
+        warm_up()
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Choose screenshot",
@@ -55,7 +55,7 @@ class RecognizeRacesTab(QWidget):
         )
         self.preview_label.setPixmap(thumbnail)
 
-        race_boxes = find_race_boxes(pixmap_to_bytes(pixmap))
+        race_boxes = find_race_boxes(pixmap_to_bytes(pixmap), APP_CONTEXT.cars_service)
         print(f"Found {len(race_boxes)} race boxes:")
         for race_box in race_boxes:
             print(race_box)
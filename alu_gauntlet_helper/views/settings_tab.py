@@ -47,10 +47,10 @@ class SettingsTab(QWidget):
         self.start_minimized.setEnabled(self.show_tray_icon.isChecked() and self.close_to_tray.isChecked())
 
     def on_save(self):
-        settings = APP_CONTEXT.settings.get()
-        settings.show_tray_icon = self.show_tray_icon.isChecked()
-        settings.close_to_tray = self.close_to_tray.isChecked()
-        settings.start_minimized = self.start_minimized.isChecked()
-        APP_CONTEXT.settings.save(settings)
+        settings = APP_CONTEXT.settings.update(
+            show_tray_icon=self.show_tray_icon.isChecked(),
+            close_to_tray=self.close_to_tray.isChecked(),
+            start_minimized=self.start_minimized.isChecked()
+        )
         self.refresh()
         self.refresh_tray_icon(settings.show_tray_icon)
\ No newline at end of file
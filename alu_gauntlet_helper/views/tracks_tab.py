@@ -1,11 +1,13 @@
 # gui/maps_tab.py
 from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
+from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QListWidget, QLineEdit, QListWidgetItem, QHBoxLayout, \
     QLabel
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
+from alu_gauntlet_helper.services.events import ENTITY_MAPS, ENTITY_TRACKS
 from alu_gauntlet_helper.services.tracks import TrackView
 from alu_gauntlet_helper.views.components.common import CLEAR_ON_ESC_FILTER
+from alu_gauntlet_helper.views.components.data_tab import DataTab
 from alu_gauntlet_helper.views.components.edit_dialog import EditDialog
 from alu_gauntlet_helper.views.components.validated_line_edit import ValidatedLineEdit
 from alu_gauntlet_helper.views.components.item_completer import ItemCompleter
@@ -20,7 +22,7 @@ class TrackDialog(EditDialog):
 
         self.maps_completer = ItemCompleter(
             self.map_edit.get_input(),
-            autocomplete=APP_CONTEXT.maps_service.autocomplete,
+            autocomplete=APP_CONTEXT.maps_service.search,
             presentation=lambda i: i.name
         )
 
@@ -56,7 +58,9 @@ class TrackDialog(EditDialog):
         return TrackView(id=self.item.id, map_id=map_id, map_name=map_name, name=name)
 
 
-class TracksTab(QWidget):
+class TracksTab(DataTab):
+    ENTITIES = (ENTITY_MAPS, ENTITY_TRACKS)
+
     def __init__(self):
         super().__init__()
 
@@ -84,22 +88,22 @@ class TracksTab(QWidget):
         layout.addLayout(top_layout)
         layout.addWidget(self.list_widget)
         self.setLayout(layout)
-        self.refresh()
 
     def refresh_debounce(self):
         self.debounce_timer.start(300)
 
     def refresh(self):
+        self.show_items(APP_CONTEXT.tracks_service.search(self.query.text()))
+
+    def show_items(self, items):
         self.list_widget.clear()
-        for t in APP_CONTEXT.tracks_service.autocomplete(self.query.text()):
+        for t in items:
             item = QListWidgetItem(f"{t.id}: {t.map_name} - {t.name}")
             item.setData(Qt.ItemDataRole.UserRole, t)
             self.list_widget.addItem(item)
 
     def on_add(self):
-        if TrackDialog(item=TrackView(name=self.query.text().strip()), action=APP_CONTEXT.tracks_service.save, parent=self).exec():
-            self.refresh()
+        TrackDialog(item=TrackView(name=self.query.text().strip()), action=APP_CONTEXT.tracks_service.save, parent=self).exec()
 
     def on_edit(self, item: QListWidgetItem):
-        if TrackDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.tracks_service.save, parent=self).exec():
-            self.refresh()
+        TrackDialog(item=item.data(Qt.ItemDataRole.UserRole), action=APP_CONTEXT.tracks_service.save, parent=self).exec()
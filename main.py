@@ -1,16 +1,23 @@
 import sys
 
+from alu_gauntlet_helper.utils.startup_profiler import STARTUP_PROFILER, on_first_paint
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 
 from alu_gauntlet_helper.app_context import APP_CONTEXT
-from alu_gauntlet_helper.services.initial_data import init_data
+from alu_gauntlet_helper.services.initial_data import init_data, catalog_version
 from alu_gauntlet_helper.utils.single_instance_lock import single_instance_lock
 from alu_gauntlet_helper.views.main_window import MainWindow
-from alu_gauntlet_helper.database import init_db
+from alu_gauntlet_helper.database import init_db, has_seed, merge_seed
 
 
 def main():
     start_minimized = "--minimized" in sys.argv
+    if "--profile-startup" in sys.argv:
+        STARTUP_PROFILER.enable(cprofile="--cprofile" in sys.argv)
+    # used by scripts/benchmark_startup.py
+    exit_after_startup = "--exit-after-startup" in sys.argv
 
     window: MainWindow | None = None
 
@@ -18,31 +25,54 @@ def main():
         if not window is None:
             window.show_window()
 
-    lock = single_instance_lock(show_window)
+    with STARTUP_PROFILER.phase("single_instance_lock"):
+        lock = single_instance_lock(show_window)
     if not lock:
         print("Application already running.")
         sys.exit(0)
 
 
-    init_db()
+    with STARTUP_PROFILER.phase("init_db"):
+        init_db()
+
+    with STARTUP_PROFILER.phase("settings"):
+        settings = APP_CONTEXT.settings.get()
+    with STARTUP_PROFILER.phase("seed_version"):
+        # the seed is opened only when the bundled catalog differs from the merged one
+        version = catalog_version()
+    if settings.seed_version != version and has_seed():
+        with STARTUP_PROFILER.phase("merge_seed"):
+            merge_seed()
+            settings = APP_CONTEXT.settings.update(seed_version=version, initial_data_loaded=True)
+    elif not settings.initial_data_loaded:
+        # running without a built seed database
+        with STARTUP_PROFILER.phase("init_data"):
+            init_data()
+            settings = APP_CONTEXT.settings.update(initial_data_loaded=True)
 
-    settings = APP_CONTEXT.settings.get()
-    if not settings.initial_data_loaded:
-        init_data()
-        settings.initial_data_loaded = True
-        APP_CONTEXT.settings.save(settings)
+    with STARTUP_PROFILER.phase("QApplication"):
+        app = QApplication(sys.argv)
+        app.setStyle("Fusion")
+        font = app.font()
+        font.setPointSize(10)
+        app.setFont(font)
 
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    font = app.font()
-    font.setPointSize(10)
-    app.setFont(font)
+    def on_started():
+        STARTUP_PROFILER.mark("first paint")
+        STARTUP_PROFILER.finish()
+        if exit_after_startup:
+            # a minimized start gets here before app.exec(), where quit() would be ignored
+            QTimer.singleShot(0, app.quit)
 
-    window = MainWindow()
+    with STARTUP_PROFILER.phase("MainWindow"):
+        window = MainWindow()
     if window.tray_icon and settings.close_to_tray and (start_minimized or settings.start_minimized):
         window.hide()
+        on_started()
     else:
-        window.show()
+        on_first_paint(window, on_started)
+        with STARTUP_PROFILER.phase("show"):
+            window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+alter table races add column created_ts integer not null default 0;
+
+update races set created_ts = cast(strftime('%s', created_at) as integer);
+
+create index races_created_ts_index
+    on races (created_ts, id, track_id, car_id);
+
+create index races_track_id_index
+    on races (track_id, created_ts);
+
+create index races_car_id_index
+    on races (car_id, created_ts);
@@ -0,0 +1,50 @@
+create virtual table maps_search using fts5(name, content='maps', content_rowid='id', tokenize='trigram');
+
+insert into maps_search (maps_search) values ('rebuild');
+
+create trigger maps_search_ai after insert on maps begin
+    insert into maps_search (rowid, name) values (new.id, new.name);
+end;
+
+create trigger maps_search_ad after delete on maps begin
+    insert into maps_search (maps_search, rowid, name) values ('delete', old.id, old.name);
+end;
+
+create trigger maps_search_au after update of name on maps begin
+    insert into maps_search (maps_search, rowid, name) values ('delete', old.id, old.name);
+    insert into maps_search (rowid, name) values (new.id, new.name);
+end;
+
+create virtual table tracks_search using fts5(name, content='tracks', content_rowid='id', tokenize='trigram');
+
+insert into tracks_search (tracks_search) values ('rebuild');
+
+create trigger tracks_search_ai after insert on tracks begin
+    insert into tracks_search (rowid, name) values (new.id, new.name);
+end;
+
+create trigger tracks_search_ad after delete on tracks begin
+    insert into tracks_search (tracks_search, rowid, name) values ('delete', old.id, old.name);
+end;
+
+create trigger tracks_search_au after update of name on tracks begin
+    insert into tracks_search (tracks_search, rowid, name) values ('delete', old.id, old.name);
+    insert into tracks_search (rowid, name) values (new.id, new.name);
+end;
+
+create virtual table cars_search using fts5(name, content='cars', content_rowid='id', tokenize='trigram');
+
+insert into cars_search (cars_search) values ('rebuild');
+
+create trigger cars_search_ai after insert on cars begin
+    insert into cars_search (rowid, name) values (new.id, new.name);
+end;
+
+create trigger cars_search_ad after delete on cars begin
+    insert into cars_search (cars_search, rowid, name) values ('delete', old.id, old.name);
+end;
+
+create trigger cars_search_au after update of name on cars begin
+    insert into cars_search (cars_search, rowid, name) values ('delete', old.id, old.name);
+    insert into cars_search (rowid, name) values (new.id, new.name);
+end;
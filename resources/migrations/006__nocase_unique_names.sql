@@ -0,0 +1,35 @@
+drop index maps_name_uindex;
+drop index tracks_map_id_name_uindex;
+drop index cars_name_uindex;
+
+-- names that differ only in case were allowed before, such duplicates are merged into the oldest row
+
+update tracks set map_id = (select min(o.id) from maps m join maps o on o.name = m.name collate nocase
+                            where m.id = tracks.map_id)
+where map_id in (select m.id from maps m join maps o on o.name = m.name collate nocase and o.id < m.id);
+
+delete from maps
+where id in (select m.id from maps m join maps o on o.name = m.name collate nocase and o.id < m.id);
+
+update races set track_id = (select min(o.id) from tracks t join tracks o on o.map_id = t.map_id and o.name = t.name collate nocase
+                             where t.id = races.track_id)
+where track_id in (select t.id from tracks t join tracks o on o.map_id = t.map_id and o.name = t.name collate nocase and o.id < t.id);
+
+delete from tracks
+where id in (select t.id from tracks t join tracks o on o.map_id = t.map_id and o.name = t.name collate nocase and o.id < t.id);
+
+update races set car_id = (select min(o.id) from cars c join cars o on o.name = c.name collate nocase
+                           where c.id = races.car_id)
+where car_id in (select c.id from cars c join cars o on o.name = c.name collate nocase and o.id < c.id);
+
+delete from cars
+where id in (select c.id from cars c join cars o on o.name = c.name collate nocase and o.id < c.id);
+
+create unique index maps_name_uindex
+    on maps (name collate nocase);
+
+create unique index tracks_map_id_name_uindex
+    on tracks (map_id, name collate nocase);
+
+create unique index cars_name_uindex
+    on cars (name collate nocase);
@@ -0,0 +1,6 @@
+-- races inserted without created_ts (seed merges, imports, manual SQL) would sort below every other race
+update races set created_ts = cast(strftime('%s', created_at) as integer) where created_ts = 0;
+
+create trigger races_created_ts_ai after insert on races when new.created_ts = 0 begin
+    update races set created_ts = cast(strftime('%s', new.created_at) as integer) where id = new.id;
+end;
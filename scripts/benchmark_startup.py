@@ -0,0 +1,112 @@
+# Runs the app's cold start (up to the first paint) several times against a temporary
+# database and fails when the median startup time regresses past the saved baseline.
+#
+#   python scripts/benchmark_startup.py -n 10 --save-baseline
+#   python scripts/benchmark_startup.py -n 10
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "scripts", "startup_baseline.json")
+
+
+def parse_report(path: str) -> dict[str, float]:
+    phases = {}
+    with open(path) as f:
+        next(f)
+        for line in f:
+            # fixed-width columns written by StartupProfiler.report
+            phases[line[:32].strip()] = float(line[32:42].replace("ms", ""))
+    return phases
+
+
+def prepare_workdir(path: str):
+    # the app resolves resources and writes its data relative to the working directory
+    resources = os.path.join(ROOT, "resources")
+    try:
+        os.symlink(resources, os.path.join(path, "resources"), target_is_directory=True)
+    except OSError:
+        shutil.copytree(resources, os.path.join(path, "resources"))
+
+
+def run_once(workdir: str, fresh_db: bool) -> tuple[dict[str, float], float]:
+    db_file = os.path.join(workdir, "app.db")
+    if fresh_db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_file + suffix):
+                os.remove(db_file + suffix)
+
+    env = dict(os.environ, ALU_HELPER_DB=db_file, ALU_HELPER_INSTANCE=f"alu_helper_benchmark_{os.getpid()}")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--profile-startup", "--exit-after-startup"],
+                            cwd=workdir, env=env, capture_output=True, text=True, timeout=120)
+    wall = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        print(result.stdout, result.stderr, file=sys.stderr)
+        sys.exit(result.returncode)
+    return parse_report(os.path.join(workdir, "startup_profile.txt")), wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--first-run", action="store_true", help="start every run from an empty database")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression of the median, 0.15 = 15%%")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir)
+        if not args.first_run:
+            # creates and fills the database, the timed runs start against an existing one
+            run_once(workdir, fresh_db=True)
+
+        reports, walls = [], []
+        for _ in range(args.runs):
+            report, wall = run_once(workdir, fresh_db=args.first_run)
+            reports.append(report)
+            walls.append(wall)
+
+    phases = list(dict.fromkeys(name for report in reports for name in report))
+    print(f"{'phase':<32}{'median':>10}{'min':>10}{'max':>10}")
+    for name in phases:
+        values = [report[name] for report in reports if name in report]
+        print(f"{name:<32}{statistics.median(values):>7.1f} ms{min(values):>7.1f} ms{max(values):>7.1f} ms")
+    print(f"{'process wall time':<32}{statistics.median(walls):>7.1f} ms{min(walls):>7.1f} ms{max(walls):>7.1f} ms")
+
+    median = statistics.median(report["total"] for report in reports)
+    key = "first_run" if args.first_run else "startup"
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        baseline[key] = median
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Saved baseline {median:.1f} ms to {args.baseline}")
+        return
+
+    if key not in baseline:
+        print("No baseline to compare with, run with --save-baseline first")
+        return
+
+    limit = baseline[key] * (1 + args.tolerance)
+    print(f"Median {median:.1f} ms, baseline {baseline[key]:.1f} ms, limit {limit:.1f} ms")
+    if median > limit:
+        print("Startup time regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Builds resources/seed.db: a fully migrated database with the initial catalog,
+# copied as a whole on first run and merged into existing databases when it changes.
+#
+#   python scripts/build_seed_db.py
+import os
+import sqlite3
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_FILE = os.path.join(ROOT, "resources", "seed.db")
+
+
+def main():
+    # the app resolves its resources relative to the working directory
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    os.environ["ALU_HELPER_DB"] = SEED_FILE
+
+    from alu_gauntlet_helper.app_context import APP_CONTEXT
+    from alu_gauntlet_helper.database import init_db, close_connections, latest_migration_version, SCHEMA_VERSION
+    from alu_gauntlet_helper.services import initial_data
+
+    # existing databases at user_version == SCHEMA_VERSION never look at the migrations directory
+    version = latest_migration_version()
+    if version != SCHEMA_VERSION:
+        sys.exit(f"SCHEMA_VERSION is {SCHEMA_VERSION}, but the latest migration is {version}, bump it in database.py")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(SEED_FILE + suffix):
+            os.remove(SEED_FILE + suffix)
+
+    init_db()
+    initial_data.init_data()
+
+    # the version follows the catalog content, rebuilding the same catalog keeps it
+    settings = APP_CONTEXT.settings.update(initial_data_loaded=True, seed_version=initial_data.catalog_version())
+    close_connections()
+
+    # ship a single self-contained file
+    conn = sqlite3.connect(SEED_FILE)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"Built {SEED_FILE} ({os.path.getsize(SEED_FILE) // 1024} KB, version {settings.seed_version[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Fails when importing the app's entry point pulls in the heavy imaging stack
+# or takes longer than the given budget.
+#
+#   python scripts/check_startup_imports.py [--budget-ms 1500]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHECK = """
+import sys
+import main
+from alu_gauntlet_helper.screen_recognition.recognition import HEAVY_MODULES
+print(",".join(m for m in HEAVY_MODULES if m in sys.modules))
+"""
+
+
+def parse_import_time(stderr: str) -> tuple[int, list[tuple[int, str]]]:
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    total = 0
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative = int(cumulative)
+        rows.append((cumulative, name.rstrip()))
+        if not name.startswith("  "):
+            total += cumulative
+    return total, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail when importing main takes longer")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to print")
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHECK],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(result.returncode)
+
+    total, rows = parse_import_time(result.stderr)
+    print(f"Startup imports: {total / 1000:.1f} ms")
+    for cumulative, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name.strip()}")
+
+    failed = False
+    loaded = result.stdout.strip()
+    if loaded:
+        print(f"Heavy modules imported at startup: {loaded}")
+        failed = True
+    if args.budget_ms and total / 1000 > args.budget_ms:
+        print(f"Startup imports exceed the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()